@@ -17,7 +17,7 @@ import os
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import pandas as pd
+from src.io_utils import load_ohlcv
 from src.data_checker import DataQualityChecker
 
 
@@ -55,7 +55,8 @@ def main():
     # ===== 3. Load CSV file =====
     print("📊 Loading data...")
     try:
-        df = pd.read_csv(file_path)
+        # Typed load: dates parsed once here, not again in the checker
+        df = load_ohlcv(file_path)
         print(f"   ✅ Loaded {len(df)} rows, {len(df.columns)} columns")
         print(f"   Columns: {list(df.columns)}")
         print()
@@ -11,6 +11,8 @@ run_basic_report.py - 基础量化报告脚本
 import sys
 import os
 
+import numpy as np
+
 # 把项目根目录添加到 Python 路径（这样才能导入 src 下的模块）
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -23,17 +25,14 @@ def calculate_returns(prices):
     计算收益率序列
     
     参数:
-        prices: 价格列表 [100, 102, 101, ...]
+        prices: 价格数组（NumPy float64）[100, 102, 101, ...]
         
     返回:
-        list: 收益率列表（比价格少一个元素）
+        np.ndarray: 收益率数组（比价格少一个元素）
     """
-    returns = []
-    for i in range(1, len(prices)):
-        # 收益率 = (今天 - 昨天) / 昨天
-        ret = (prices[i] - prices[i-1]) / prices[i-1]
-        returns.append(ret)
-    return returns
+    prices = np.asarray(prices, dtype=np.float64)
+    # 收益率 = (今天 - 昨天) / 昨天，一次向量化运算算完所有天
+    return np.diff(prices) / prices[:-1]
 
 
 def calculate_nav(returns):
@@ -41,17 +40,14 @@ def calculate_nav(returns):
     计算净值序列
     
     参数:
-        returns: 收益率列表
+        returns: 收益率数组
         
     返回:
-        list: 净值列表（从1.0开始）
+        np.ndarray: 净值数组（从1.0开始）
     """
-    nav = [1.0]  # 起始净值为 1
-    for ret in returns:
-        # 新净值 = 上一个净值 × (1 + 收益率)
-        new_nav = nav[-1] * (1 + ret)
-        nav.append(new_nav)
-    return nav
+    returns = np.asarray(returns, dtype=np.float64)
+    # 新净值 = 上一个净值 × (1 + 收益率)，即 (1 + 收益率) 的累乘
+    return np.concatenate(([1.0], np.cumprod(1.0 + returns)))
 
 
 def main():
@@ -76,8 +72,8 @@ def main():
     print()
     
     # ===== 2. 提取价格数据 =====
-    prices = df['close'].tolist()  # 转换为列表
-    dates = df['date'].tolist()
+    prices = df['close'].to_numpy(dtype=np.float64)  # 转换为 NumPy 数组
+    dates = df['date'].astype(str).tolist()  # 日期转为字符串便于打印
     
     print("📈 价格数据预览:")
     print(f"   起始日期: {dates[0]}, 价格: {prices[0]}")
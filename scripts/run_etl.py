@@ -9,6 +9,9 @@ This script runs the complete ETL (Extract-Transform-Load) pipeline:
 Usage:
     python scripts/run_etl.py
     python scripts/run_etl.py --input path/to/input.csv --output path/to/output.parquet
+    python scripts/run_etl.py --engine polars    # single streaming pass (needs polars)
+    python scripts/run_etl.py --chunksize 500000 # low-memory chunked pass
+    python scripts/run_etl.py --input data/raw/2024-*.csv   # many files, read in parallel
 
 Author: [Your Name]
 """
@@ -16,26 +19,80 @@ Author: [Your Name]
 import sys
 import os
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Union
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import pandas as pd
-from src.processors import DataProcessor
+import pyarrow.parquet as pq
+from src.io_utils import load_ohlcv
+from src.processors import DataProcessor, process_stock_data_chunked
 
 
-def run_etl_pipeline(input_path: str, output_path: str) -> pd.DataFrame:
+# Files read at the same time by read_raw_csv_many. Each read already
+# parses on all cores (pyarrow engine), so more threads would only
+# oversubscribe them; a few overlap one file's GIL-bound pandas
+# conversion with the next file's parse
+MAX_READ_WORKERS = 4
+
+
+def read_raw_csv(path: str) -> pd.DataFrame:
+    """
+    Read one raw OHLCV CSV file.
+    
+    Dtypes are declared up front (float32 prices) and dates are
+    parsed once while reading (see src.io_utils.load_ohlcv).
+    """
+    return load_ohlcv(path)
+
+
+def read_raw_csv_many(paths: Sequence[str], max_workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read many raw CSV files in parallel and combine them into one DataFrame.
+    
+    load_ohlcv's pyarrow engine already parses each file on all cores,
+    but converting the result to pandas holds the GIL. A few files are
+    read at once (MAX_READ_WORKERS threads), so one file's parse runs
+    while another is being converted, without oversubscribing the
+    cores with one pyarrow thread pool per CPU.
+    
+    Args:
+        paths: CSV file paths (e.g., one file per trading day)
+        max_workers: Number of reader threads
+            (default: MAX_READ_WORKERS, at most one per file)
+        
+    Returns:
+        All rows in file order, with a fresh 0..n-1 index
+    """
+    if max_workers is None:
+        max_workers = max(1, min(MAX_READ_WORKERS, len(paths)))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(read_raw_csv, paths))
+    
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_etl_pipeline(
+    input_path: Union[str, List[str]],
+    output_path: str
+) -> pd.DataFrame:
     """
     Run the complete ETL pipeline.
     
     Args:
-        input_path: Path to input CSV file
+        input_path: Path to input CSV file, or a list of paths
+                    (read in parallel and processed as one dataset)
         output_path: Path for output Parquet file
         
     Returns:
         Processed DataFrame
     """
     
+    input_paths = [input_path] if isinstance(input_path, str) else list(input_path)
+    
     print()
     print("=" * 60)
     print("        🏭 ETL PIPELINE")
@@ -45,14 +102,18 @@ def run_etl_pipeline(input_path: str, output_path: str) -> pd.DataFrame:
     # ===== STEP 1: EXTRACT =====
     print("📥 STEP 1: EXTRACT")
     print("-" * 40)
-    print(f"   Reading: {input_path}")
-    
-    if not os.path.exists(input_path):
-        print(f"   ❌ Error: File not found: {input_path}")
-        return None
+    for path in input_paths:
+        print(f"   Reading: {path}")
+        
+        if not os.path.exists(path):
+            print(f"   ❌ Error: File not found: {path}")
+            return None
     
     try:
-        df_raw = pd.read_csv(input_path)
+        if len(input_paths) == 1:
+            df_raw = read_raw_csv(input_paths[0])
+        else:
+            df_raw = read_raw_csv_many(input_paths)
         print(f"   ✅ Loaded {len(df_raw)} rows, {len(df_raw.columns)} columns")
         print(f"   Columns: {list(df_raw.columns)}")
     except Exception as e:
@@ -115,6 +176,8 @@ def run_etl_pipeline(input_path: str, output_path: str) -> pd.DataFrame:
         print(f"   Created directory: {output_dir}")
     
     try:
+        # Defaults: zstd (smaller than snappy at a similar speed) and
+        # PARQUET_ROW_GROUP_SIZE-row groups with min/max statistics
         processor.save_to_parquet(output_path)
     except Exception as e:
         print(f"   ❌ Error saving file: {e}")
@@ -166,6 +229,101 @@ def run_etl_pipeline(input_path: str, output_path: str) -> pd.DataFrame:
     return df_final
 
 
+def run_lazy_etl_pipeline(input_path: str, output_path: str) -> bool:
+    """
+    Run the ETL pipeline as a single Polars lazy plan.
+    
+    The CSV is scanned and the result streamed straight to Parquet,
+    so no intermediate DataFrame is ever materialized.
+    
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path for output Parquet file
+        
+    Returns:
+        True if the pipeline succeeded, False otherwise
+    """
+    
+    print()
+    print("=" * 60)
+    print("        🏭 ETL PIPELINE (Polars lazy)")
+    print("=" * 60)
+    print()
+    
+    if not os.path.exists(input_path):
+        print(f"   ❌ Error: File not found: {input_path}")
+        return False
+    
+    try:
+        from src.processors_lazy import run_lazy_pipeline
+    except ImportError as e:
+        print(f"   ❌ Error: {e}")
+        return False
+    
+    # Ensure output directory exists
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"   Created directory: {output_dir}")
+    
+    print(f"   Scanning: {input_path}")
+    try:
+        run_lazy_pipeline(input_path, output_path)
+    except Exception as e:
+        print(f"   ❌ Error running pipeline: {e}")
+        return False
+    
+    print()
+    print("✅ ETL Pipeline completed successfully!")
+    print("=" * 60)
+    print()
+    
+    return True
+
+
+def run_chunked_etl_pipeline(input_path: str, output_path: str, chunksize: int) -> bool:
+    """
+    Run the ETL pipeline in fixed-size chunks to cut peak memory.
+    
+    Args:
+        input_path: Path to input CSV file (must be sorted by date)
+        output_path: Path for output Parquet file
+        chunksize: Number of CSV rows per chunk
+        
+    Returns:
+        True if the pipeline succeeded, False otherwise
+    """
+    
+    print()
+    print("=" * 60)
+    print("        🏭 ETL PIPELINE (chunked)")
+    print("=" * 60)
+    print()
+    
+    if not os.path.exists(input_path):
+        print(f"   ❌ Error: File not found: {input_path}")
+        return False
+    
+    # Ensure output directory exists
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"   Created directory: {output_dir}")
+    
+    try:
+        process_stock_data_chunked(input_path, output_path, chunksize=chunksize)
+    except Exception as e:
+        print(f"   ❌ Error running pipeline: {e}")
+        return False
+    
+    print()
+    print("✅ ETL Pipeline completed successfully!")
+    print("=" * 60)
+    print()
+    
+    return True
+
+
 def verify_output(output_path: str) -> bool:
     """
     Verify the output file can be read correctly.
@@ -180,14 +338,18 @@ def verify_output(output_path: str) -> bool:
     print("-" * 40)
     
     try:
-        df = pd.read_parquet(output_path)
+        # Read only the file footer (metadata): row count and column names
+        # are available without decoding any column data
+        parquet_file = pq.ParquetFile(output_path, memory_map=True)
+        num_rows = parquet_file.metadata.num_rows
+        columns = parquet_file.schema_arrow.names
         print(f"   ✅ File readable: {output_path}")
-        print(f"   ✅ Rows: {len(df)}")
-        print(f"   ✅ Columns: {list(df.columns)}")
+        print(f"   ✅ Rows: {num_rows}")
+        print(f"   ✅ Columns: {columns}")
         
         # Check key columns exist
         required_cols = ['date', 'close', 'MA5', 'MA20', 'Vol_20']
-        missing_cols = [c for c in required_cols if c not in df.columns]
+        missing_cols = [c for c in required_cols if c not in columns]
         
         if missing_cols:
             print(f"   ⚠️  Missing columns: {missing_cols}")
@@ -210,14 +372,27 @@ def main():
     )
     parser.add_argument(
         '--input', '-i',
-        default='data/raw/stock_data_dirty.csv',
-        help='Input CSV file path'
+        nargs='+',
+        default=['data/raw/stock_data_dirty.csv'],
+        help='Input CSV file path(s); several files are read in parallel'
     )
     parser.add_argument(
         '--output', '-o',
         default='data/processed/market_data.parquet',
         help='Output Parquet file path'
     )
+    parser.add_argument(
+        '--engine', '-e',
+        choices=['pandas', 'polars'],
+        default='pandas',
+        help='Processing engine (polars runs one lazy streaming plan)'
+    )
+    parser.add_argument(
+        '--chunksize', '-c',
+        type=int,
+        default=None,
+        help='Process the CSV in chunks of this many rows (input must be sorted by date)'
+    )
     parser.add_argument(
         '--verify', '-v',
         action='store_true',
@@ -226,10 +401,20 @@ def main():
     
     args = parser.parse_args()
     
-    # Run pipeline
-    df = run_etl_pipeline(args.input, args.output)
+    # Streaming engines work on a single file
+    if len(args.input) > 1 and (args.engine == 'polars' or args.chunksize):
+        print("❌ --engine polars and --chunksize accept a single input file")
+        sys.exit(1)
     
-    if df is None:
+    # Run pipeline
+    if args.engine == 'polars':
+        success = run_lazy_etl_pipeline(args.input[0], args.output)
+    elif args.chunksize:
+        success = run_chunked_etl_pipeline(args.input[0], args.output, args.chunksize)
+    else:
+        success = run_etl_pipeline(args.input, args.output) is not None
+    
+    if not success:
         print("❌ Pipeline failed!")
         sys.exit(1)
     
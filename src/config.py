@@ -0,0 +1,27 @@
+"""
+config.py - Project Configuration Settings
+
+Shared constants used by the I/O helpers and ETL scripts.
+
+Author: [Your Name]
+"""
+
+import numpy as np
+
+
+# ================================================================
+# OHLCV column dtypes (applied at load time)
+# ================================================================
+
+# Prices are stored as float32: ~7 significant digits is plenty for
+# prices, and it halves the bytes every vectorized check and rolling
+# window has to stream from memory.
+# Volume uses pandas' nullable Int64 so rows with a missing volume can
+# still be loaded (and later filled by the cleaner).
+OHLCV_DTYPES = {
+    'open': np.float32,
+    'high': np.float32,
+    'low': np.float32,
+    'close': np.float32,
+    'volume': 'Int64',
+}
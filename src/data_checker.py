@@ -11,6 +11,8 @@ This module provides tools to check OHLCV data for common issues:
 Author: [Your Name]
 """
 
+import sys
+
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
@@ -30,6 +32,9 @@ class DataQualityChecker:
     # Required columns for OHLCV data
     REQUIRED_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
     
+    # Numeric columns (prices + volume) used by the logical checks
+    OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+    
     def __init__(self, df: pd.DataFrame):
         """
         Initialize the checker with a DataFrame.
@@ -40,8 +45,9 @@ class DataQualityChecker:
         Raises:
             ValueError: If required columns are missing
         """
-        # Make a copy to avoid modifying the original data
-        self.df = df.copy()
+        # Keep a reference instead of a copy: the checker is read-only,
+        # so copying would only double peak memory on large datasets
+        self.df = df
         
         # Validate required columns exist
         self._validate_columns()
@@ -49,6 +55,26 @@ class DataQualityChecker:
         # Convert date column to datetime
         self._prepare_date_column()
         
+        # Cache the OHLCV columns as ONE 2-D NumPy array (extracted once,
+        # reused by every check). The checks only read the per-column
+        # views in self._cols, never self.df. Column-major (Fortran)
+        # order makes each of those views a contiguous array instead of
+        # a strided slice (no copy if to_numpy already returned it so)
+        self._ohlcv = np.asfortranarray(self.df[self.OHLCV_COLUMNS].to_numpy(
+            dtype=np.float64, na_value=np.nan
+        ))
+        self._cols = {
+            col: self._ohlcv[:, i] for i, col in enumerate(self.OHLCV_COLUMNS)
+        }
+        
+        # Compute all logical-consistency masks in a single pass
+        self._compute_logical_masks()
+        
+        # Per-column NaN counts and the duplicate-date mask, computed once
+        # (one full NaN scan and one hash pass over the dates)
+        self._na = self.df.isnull().sum()
+        self._dup = pd.Index(self._dates).duplicated(keep='first')
+        
         # Initialize report dictionary
         self.report = {}
     
@@ -63,8 +89,45 @@ class DataQualityChecker:
             raise ValueError(f"Missing required columns: {missing_cols}")
     
     def _prepare_date_column(self):
-        """Convert date column to datetime format."""
-        self.df['date'] = pd.to_datetime(self.df['date'])
+        """
+        Convert date column to a datetime64 NumPy array.
+        
+        The parsed dates are stored in self._dates, so the caller's
+        DataFrame is never modified.
+        """
+        dates = self.df['date']
+        
+        # Skip re-parsing when the loader already parsed the dates
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+        
+        self._dates = dates.to_numpy(dtype='datetime64[ns]')
+    
+    def _compute_logical_masks(self):
+        """
+        Compute the boolean masks for every logical check at once.
+        
+        Each mask is a NumPy bool array with one entry per row. The
+        check_* methods below just count them, so the OHLCV data is
+        compared once instead of once per check.
+        
+        Note:
+            NaN compares as False, so missing values are never counted
+            as logical errors (they are reported by check_missing_values).
+        """
+        o = self._cols['open']
+        h = self._cols['high']
+        l = self._cols['low']
+        c = self._cols['close']
+        
+        # High < Low
+        self._hl_mask = h < l
+        
+        # Open/Close out of [low, high]
+        self._range_mask = (o < l) | (o > h) | (c < l) | (c > h)
+        
+        # Negative prices or volume: one 2-D comparison, reduced per row
+        self._neg_mask = (self._ohlcv < 0).any(axis=1)
     
     # ================================================================
     # CHECK 1: Basic Integrity (基础完整性)
@@ -77,8 +140,8 @@ class DataQualityChecker:
         Returns:
             Dict mapping column names to count of missing values
         """
-        # Use isnull() to find NaN, sum() to count them
-        missing = self.df.isnull().sum()
+        # NaN counts per column were computed once in __init__
+        missing = self._na
         
         # Convert to dictionary, only include columns with missing values
         missing_dict = missing[missing > 0].to_dict()
@@ -92,9 +155,9 @@ class DataQualityChecker:
         Returns:
             Number of duplicate date entries
         """
-        # duplicated() returns True for duplicate rows
-        # keep='first' means first occurrence is not marked as duplicate
-        duplicate_count = self.df['date'].duplicated(keep='first').sum()
+        # The duplicate mask was built once in __init__:
+        # True for duplicate rows, first occurrence is not marked
+        duplicate_count = self._dup.sum()
         
         return int(duplicate_count)
     
@@ -109,10 +172,7 @@ class DataQualityChecker:
         Returns:
             Number of rows where high < low
         """
-        # Vectorized comparison: compare entire columns at once
-        invalid_rows = self.df['high'] < self.df['low']
-        
-        return int(invalid_rows.sum())
+        return int(self._hl_mask.sum())
     
     def check_price_range(self) -> int:
         """
@@ -121,18 +181,7 @@ class DataQualityChecker:
         Returns:
             Number of rows where open or close is out of range
         """
-        # Check if open is within range
-        open_below_low = self.df['open'] < self.df['low']
-        open_above_high = self.df['open'] > self.df['high']
-        
-        # Check if close is within range
-        close_below_low = self.df['close'] < self.df['low']
-        close_above_high = self.df['close'] > self.df['high']
-        
-        # Combine all conditions with OR (|)
-        out_of_range = open_below_low | open_above_high | close_below_low | close_above_high
-        
-        return int(out_of_range.sum())
+        return int(self._range_mask.sum())
     
     def check_negative_values(self) -> int:
         """
@@ -141,16 +190,7 @@ class DataQualityChecker:
         Returns:
             Number of rows with negative values
         """
-        price_cols = ['open', 'high', 'low', 'close', 'volume']
-        
-        # Check each column for negative values
-        negative_mask = pd.Series([False] * len(self.df))
-        
-        for col in price_cols:
-            # Use | to combine: any column being negative marks the row
-            negative_mask = negative_mask | (self.df[col] < 0)
-        
-        return int(negative_mask.sum())
+        return int(self._neg_mask.sum())
     
     def get_total_logical_errors(self) -> int:
         """
@@ -159,24 +199,9 @@ class DataQualityChecker:
         Returns:
             Total number of rows with logical errors
         """
-        # High < Low
-        hl_error = self.df['high'] < self.df['low']
-        
-        # Open/Close out of range
-        open_error = (self.df['open'] < self.df['low']) | (self.df['open'] > self.df['high'])
-        close_error = (self.df['close'] < self.df['low']) | (self.df['close'] > self.df['high'])
-        
-        # Negative values
-        neg_error = (
-            (self.df['open'] < 0) | 
-            (self.df['high'] < 0) | 
-            (self.df['low'] < 0) | 
-            (self.df['close'] < 0) | 
-            (self.df['volume'] < 0)
-        )
-        
-        # Combine all errors
-        any_error = hl_error | open_error | close_error | neg_error
+        # Combine the cached masks with OR: a row counts once,
+        # even if it has several errors
+        any_error = self._hl_mask | self._range_mask | self._neg_mask
         
         return int(any_error.sum())
     
@@ -193,22 +218,20 @@ class DataQualityChecker:
                 - large_gaps: count of gaps > 3 days
                 - max_gap_days: maximum gap in days
         """
-        # Sort by date first
-        sorted_df = self.df.sort_values('date')
+        # Filter BEFORE sorting: drop missing dates (NaT has no gap) first,
+        # then np.unique sorts and removes duplicates in one call
+        # (a duplicate date is a 0-day gap, which never affects the result)
+        valid_dates = self._dates[~np.isnat(self._dates)]
+        sorted_dates = np.unique(valid_dates)
         
-        # Calculate difference between consecutive dates
-        # diff() calculates the difference between current and previous row
-        date_diffs = sorted_df['date'].diff()
-        
-        # Convert to days (timedelta to integer)
-        # dropna() removes the first row (which has no previous date)
-        gap_days = date_diffs.dt.days.dropna()
+        # Difference between consecutive dates, converted to whole days
+        gap_days = np.diff(sorted_dates).astype('timedelta64[D]').astype(np.int64)
         
         # Count gaps larger than 3 days
         large_gaps = (gap_days > 3).sum()
         
         # Find maximum gap
-        max_gap = int(gap_days.max()) if len(gap_days) > 0 else 0
+        max_gap = int(gap_days.max()) if gap_days.size > 0 else 0
         
         return {
             'large_gaps': int(large_gaps),
@@ -229,26 +252,27 @@ class DataQualityChecker:
         Returns:
             Number of days with moves exceeding threshold
         """
-        # Sort by date to ensure correct order
-        sorted_df = self.df.sort_values('date').copy()
+        # Order of rows by date (stable: ties keep their original order)
+        # Only the close column is reordered, not the whole DataFrame
+        order = np.argsort(self._dates, kind='stable')
+        close = self._cols['close'].take(order)
+        
+        # Nothing to compare with fewer than 2 rows
+        if close.size < 2:
+            return 0
         
-        # Get previous day's close price using shift()
-        # shift(1) moves all values down by 1 row
-        prev_close = sorted_df['close'].shift(1)
+        # Yesterday's close as an aligned view (no shifted copy)
+        prev_close = close[:-1]
         
         # Calculate daily return: (today - yesterday) / yesterday
-        # Use np.where to handle division by zero
-        daily_return = np.where(
-            prev_close != 0,                          # Condition
-            (sorted_df['close'] - prev_close) / prev_close,  # If True
-            np.nan                                    # If False (avoid div by zero)
-        )
+        # The masked divide skips rows where yesterday's close is 0,
+        # so no division by zero is ever performed; they stay NaN
+        daily_return = np.full(prev_close.shape, np.nan)
+        np.divide(np.diff(close), prev_close, out=daily_return, where=prev_close != 0)
         
         # Count absolute returns exceeding threshold
-        extreme_count = (np.abs(daily_return) > threshold).sum()
-        
-        # Subtract NaN count (first row has no return)
-        extreme_count = int(extreme_count)
+        # (NaN compares as False, so it is never counted)
+        extreme_count = int((np.abs(daily_return) > threshold).sum())
         
         return extreme_count
     
@@ -283,80 +307,91 @@ class DataQualityChecker:
         return self.report
     
     def print_report(self):
-        """Print a formatted quality report to console."""
+        """
+        Print a formatted quality report to console.
+        
+        The report is built as a list of lines and written to stdout in
+        a single call, instead of one print() (lock + flush) per line.
+        """
         
         # Run checks if not already done
         if not self.report:
             self.run_all_checks()
         
-        # Print formatted report
-        print("=" * 60)
-        print("        📋 DATA QUALITY REPORT")
-        print("=" * 60)
-        print()
+        report = self.report
+        lines = []
+        
+        # Header
+        lines.append("=" * 60)
+        lines.append("        📋 DATA QUALITY REPORT")
+        lines.append("=" * 60)
+        lines.append("")
         
         # Basic Info
-        print("📊 BASIC INFO")
-        print("-" * 40)
-        print(f"   Total Rows: {self.report['total_rows']}")
-        print()
+        lines.append("📊 BASIC INFO")
+        lines.append("-" * 40)
+        lines.append(f"   Total Rows: {report['total_rows']}")
+        lines.append("")
         
         # Missing Values
-        print("🔍 MISSING VALUES")
-        print("-" * 40)
-        if self.report['missing_values']:
-            for col, count in self.report['missing_values'].items():
-                print(f"   {col}: {count} missing")
+        lines.append("🔍 MISSING VALUES")
+        lines.append("-" * 40)
+        if report['missing_values']:
+            for col, count in report['missing_values'].items():
+                lines.append(f"   {col}: {count} missing")
         else:
-            print("   ✅ No missing values")
-        print()
+            lines.append("   ✅ No missing values")
+        lines.append("")
         
         # Duplicate Dates
-        print("📅 DUPLICATE DATES")
-        print("-" * 40)
-        if self.report['duplicate_dates'] > 0:
-            print(f"   ❌ {self.report['duplicate_dates']} duplicate date(s) found")
+        lines.append("📅 DUPLICATE DATES")
+        lines.append("-" * 40)
+        if report['duplicate_dates'] > 0:
+            lines.append(f"   ❌ {report['duplicate_dates']} duplicate date(s) found")
         else:
-            print("   ✅ No duplicate dates")
-        print()
+            lines.append("   ✅ No duplicate dates")
+        lines.append("")
         
         # Logical Errors
-        print("⚠️  LOGICAL CONSISTENCY")
-        print("-" * 40)
-        print(f"   High < Low errors:     {self.report['high_low_errors']}")
-        print(f"   Price out of range:    {self.report['price_range_errors']}")
-        print(f"   Negative values:       {self.report['negative_values']}")
-        print(f"   Total logical errors:  {self.report['logical_errors_total']}")
-        print()
+        lines.append("⚠️  LOGICAL CONSISTENCY")
+        lines.append("-" * 40)
+        lines.append(f"   High < Low errors:     {report['high_low_errors']}")
+        lines.append(f"   Price out of range:    {report['price_range_errors']}")
+        lines.append(f"   Negative values:       {report['negative_values']}")
+        lines.append(f"   Total logical errors:  {report['logical_errors_total']}")
+        lines.append("")
         
         # Date Gaps
-        print("📆 DATE CONTINUITY")
-        print("-" * 40)
-        print(f"   Gaps > 3 days:   {self.report['large_gaps']}")
-        print(f"   Max gap (days):  {self.report['max_gap_days']}")
-        print()
+        lines.append("📆 DATE CONTINUITY")
+        lines.append("-" * 40)
+        lines.append(f"   Gaps > 3 days:   {report['large_gaps']}")
+        lines.append(f"   Max gap (days):  {report['max_gap_days']}")
+        lines.append("")
         
         # Extreme Moves
-        print("📈 EXTREME PRICE MOVES (>10%)")
-        print("-" * 40)
-        print(f"   Count: {self.report['extreme_moves']} day(s)")
-        print()
+        lines.append("📈 EXTREME PRICE MOVES (>10%)")
+        lines.append("-" * 40)
+        lines.append(f"   Count: {report['extreme_moves']} day(s)")
+        lines.append("")
         
         # Summary
-        print("=" * 60)
+        lines.append("=" * 60)
         total_issues = (
-            sum(self.report['missing_values'].values()) +
-            self.report['duplicate_dates'] +
-            self.report['logical_errors_total'] +
-            self.report['large_gaps'] +
-            self.report['extreme_moves']
+            sum(report['missing_values'].values()) +
+            report['duplicate_dates'] +
+            report['logical_errors_total'] +
+            report['large_gaps'] +
+            report['extreme_moves']
         )
         
         if total_issues == 0:
-            print("✅ RESULT: Data is CLEAN!")
+            lines.append("✅ RESULT: Data is CLEAN!")
         else:
-            print(f"❌ RESULT: {total_issues} issue(s) found. Please review.")
-        print("=" * 60)
+            lines.append(f"❌ RESULT: {total_issues} issue(s) found. Please review.")
+        lines.append("=" * 60)
+        
+        # One write for the whole report
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ================================================================
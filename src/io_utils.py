@@ -1,22 +1,53 @@
 """
 io_utils.py - 文件读写工具
-提供 CSV 文件的读取和保存功能
+提供 CSV / Parquet / Feather 文件的读取和保存功能
 """
 
+import numpy as np
 import pandas as pd
 import os
 
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+from src.config import OHLCV_DTYPES
+
+
+def _arrow_column_types():
+    """把 OHLCV_DTYPES 转换为 pyarrow 的列类型（供 pyarrow CSV 读取器使用）"""
+    column_types = {'date': pa.timestamp('ns')}
+    for col, dtype in OHLCV_DTYPES.items():
+        if dtype == 'Int64':
+            column_types[col] = pa.int64()
+        else:
+            column_types[col] = pa.from_numpy_dtype(dtype)
+    return column_types
+
+
+def _nullable_int_columns(df):
+    """返回 df 中按 OHLCV_DTYPES 应为可空整数（'Int64'）的列 -> 类型映射"""
+    return {
+        col: dtype for col, dtype in OHLCV_DTYPES.items()
+        if dtype == 'Int64' and col in df.columns
+    }
+
 
 def read_csv(path):
     """
-    读取 CSV 文件
+    读取 CSV 文件（也支持 .parquet / .feather）
     
     参数:
-        path: 文件路径（字符串）
+        path: 文件路径（字符串），按后缀自动选择读取方式
         
     返回:
         DataFrame: 表格数据
         
+    说明:
+        读取 CSV 时，OHLCV 列按 config.OHLCV_DTYPES 指定类型
+        （价格用 float32，减半内存），date 列直接解析为日期时间；
+        文件中不存在的列会被忽略；
+        无法解析的日期读成 NaT，有小数的成交量保留为 float64
+        
     异常:
         如果文件不存在，抛出友好的错误提示
     """
@@ -24,11 +55,103 @@ def read_csv(path):
     if not os.path.exists(path):
         raise FileNotFoundError(f"文件不存在: {path}")
     
-    # 读取 CSV 并返回
-    df = pd.read_csv(path)
+    # 列式格式直接用对应的读取函数（比解析 CSV 快得多）
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    if path.endswith('.feather'):
+        return pd.read_feather(path)
+    
+    # CSV 优先用 pyarrow 读取：多线程解析，解码时不占用 GIL
+    if path.endswith('.csv'):
+        try:
+            table = pacsv.read_csv(
+                path,
+                read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+                convert_options=pacsv.ConvertOptions(column_types=_arrow_column_types())
+            )
+            # self_destruct=True：边转换边释放 Arrow 内存，避免峰值内存翻倍
+            df = table.to_pandas(self_destruct=True)
+            # Arrow 的 int64 列转成 pandas 后是 int64（有缺失值时是 float64），
+            # 这里统一转为 OHLCV_DTYPES 的类型（如 volume 用 Int64），
+            # 保证和下面 pandas 解析器读出来的类型完全一致
+            return df.astype(_nullable_int_columns(df))
+        except pa.ArrowInvalid:
+            # pyarrow 解析失败（如行长度不一致）时，退回 pandas 的解析器
+            pass
+    
+    # 读取 CSV 并返回：可空整数列先按 float64 读入，
+    # 这样有小数的成交量（如 100.5）不会让整个文件读取失败
+    int_columns = {col: dtype for col, dtype in OHLCV_DTYPES.items() if dtype == 'Int64'}
+    df = pd.read_csv(path, dtype={**OHLCV_DTYPES, **dict.fromkeys(int_columns, 'float64')})
+    for col, dtype in _nullable_int_columns(df).items():
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError):
+            # 有小数：保留为 float64
+            pass
+    if 'date' in df.columns:
+        # 无法解析的日期变成 NaT（而不是整个文件读取失败）；
+        # 统一为纳秒精度（和 pyarrow 路径的 timestamp('ns') 一致；
+        # pandas 3 的 to_datetime 默认按字符串推断为微秒或秒）
+        df['date'] = pd.to_datetime(df['date'], errors='coerce').dt.as_unit('ns')
+    return df
+
+
+def load_ohlcv(path, date_format='%Y-%m-%d'):
+    """
+    读取 OHLCV 格式的 CSV 文件，并一次性完成类型转换
+    
+    参数:
+        path: 文件路径（字符串）
+        date_format: 日期格式（默认 ISO 格式 '%Y-%m-%d'）
+        
+    返回:
+        DataFrame: date 列已是 datetime64，价格列是 float32
+        
+    说明:
+        日期只在读取时解析一次（给定格式走快速路径），
+        DataQualityChecker / DataProcessor 发现 date 已是日期类型就不会重复解析。
+        空白日期读成 NaT；如果日期格式不匹配，date 列保持为字符串，由后续模块自动推断解析。
+        没有 date 列或有短行（列数不足）的文件也能读取，和 read_csv 一样。
+    """
+    # 检查文件是否存在
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"文件不存在: {path}")
+    
+    # date 列先按字符串读入（缺少 date 列的文件照常读入，
+    # 由 DataQualityChecker 报告「缺少必需列」，而不是在这里报 KeyError）。
+    # 注意：pyarrow 引擎配合 parse_dates 时，空白日期会变成字符串 'None'，
+    # 所以不用 parse_dates，读完后再自己转换
+    columns = pd.read_csv(path, nrows=0).columns
+    dtype = dict(OHLCV_DTYPES)
+    if 'date' in columns:
+        dtype['date'] = 'string'
+    
+    try:
+        df = pd.read_csv(path, engine='pyarrow', dtype=dtype)
+    except pd.errors.ParserError:
+        # pyarrow 遇到行长度不一致（如缺几列的短行）会直接报错；
+        # 退回 pandas 的 C 解析器，缺失的单元格填 NaN，脏数据也能读进来检查
+        df = pd.read_csv(path, dtype=dtype)
+    
+    if 'date' in df.columns:
+        df['date'] = _parse_date_column(df['date'], date_format)
     return df
 
 
+def _parse_date_column(dates, date_format):
+    """
+    按 date_format 解析日期字符串列（load_ohlcv 内部使用）
+    
+    空白单元格变成 NaT；如果有非空的日期不符合格式，
+    整列保持为字符串（空白为 NaN），交给后续模块自动推断解析
+    """
+    parsed = pd.to_datetime(dates, format=date_format, errors='coerce')
+    if parsed.notna().sum() == dates.notna().sum():
+        return parsed
+    return pd.Series(dates.to_numpy(dtype=object, na_value=np.nan), index=dates.index, name=dates.name)
+
+
 def save_csv(df, path):
     """
     保存数据到 CSV 文件
@@ -45,3 +168,25 @@ def save_csv(df, path):
     # 保存文件（index=False 表示不保存行号）
     df.to_csv(path, index=False)
     print(f"文件已保存: {path}")
+
+
+def save_feather(df, path):
+    """
+    保存数据到 Feather 文件（用于中间缓存文件）
+    
+    参数:
+        df: 要保存的 DataFrame
+        path: 保存路径（字符串），如 'data/cache/prices.feather'
+        
+    说明:
+        Feather 是 Arrow 的磁盘格式，读写几乎是内存拷贝，
+        配合 lz4 压缩，体积小且重新加载非常快，适合作为中间结果缓存
+    """
+    # 确保目录存在（如果不存在就创建）
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    
+    # Feather 不支持非默认索引，先重置为 0..n-1
+    df.reset_index(drop=True).to_feather(path, compression='lz4')
+    print(f"文件已保存: {path}")
@@ -0,0 +1,718 @@
+"""
+kernels.py - Rolling-Window Kernels
+
+This module provides O(1)-per-step rolling statistics:
+- rolling_sum: Running-sum over a fixed window (add new, subtract expired),
+  split across all cores for series of PARALLEL_MIN_SIZE rows or more
+- rolling_mean: Simple moving average built on rolling_sum
+- rolling_mean_std: Moving average AND moving std in one pass (Welford)
+- daily_return: (close[t] - close[t-1]) / close[t-1] on the raw array
+- rolling_features: daily return, two moving averages and the rolling
+  std of returns, all from ONE pass over the close prices
+- rolling_features_2d: rolling_features for many symbols at once,
+  one symbol per row, rows spread across all cores
+
+Why not rolling().apply(np.mean)?
+    rolling().apply() calls a Python function once PER WINDOW, so every
+    step re-reads and re-sums all `window` values: O(N * window) plus
+    Python call overhead. A running sum touches each value twice
+    (once entering, once leaving the window): O(N) total.
+    
+    # ✅ Fast: incremental C/Numba loop
+    rolling_mean(close, 10)
+    df['close'].rolling(10).mean()
+    
+    # ❌ Slow: Python call per window
+    df['close'].rolling(10).apply(np.mean)
+
+Every Numba kernel is compiled with cache=True: the machine code is
+stored next to this file (__pycache__), so only the first run after a
+change pays the JIT compile, per input dtype.
+
+Numba is an optional dependency. Without it, the kernels fall back to
+vectorized NumPy prefix sums (np.cumsum): one pass per statistic, O(N).
+Moving averages then use Bottleneck's C move_mean instead, if it is
+installed (one running-sum pass, no prefix-sum buffer).
+
+float32 input stays float32 (half the bytes to stream through memory);
+the running sums themselves are always accumulated in float64.
+
+Author: [Your Name]
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange, get_num_threads
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+
+# Series at least this long use the multi-threaded rolling_sum kernel
+# (below it, starting the threads costs more than it saves)
+PARALLEL_MIN_SIZE = 1_000_000
+
+# Rows per block in the no-Numba rolling std (see _rolling_mean_std_cumsum):
+# short enough that a block's values stay close to its mean, long enough
+# that the per-block NumPy calls are cheap
+_CUMSUM_BLOCK = 2048
+
+
+# ================================================================
+# NUMBA KERNELS
+# ================================================================
+
+if NUMBA_AVAILABLE:
+    
+    @njit(inline='always')
+    def _rolling_sum_impl(x, window, divisor):
+        """
+        Running-sum kernel body: one pass, O(1) work per step.
+        
+        Every full window's sum is divided by `divisor` (1.0 for a sum,
+        window for a mean). A window containing NaN or inf produces NaN
+        (same as pandas with min_periods=window). inf is counted like
+        NaN, not added: subtracting it again would give inf - inf = NaN
+        and poison the running sum for the rest of the series.
+        
+        Inlined into its callers: when they pass literal window/divisor
+        values, the compiler specializes the loop for those constants.
+        """
+        n = x.shape[0]
+        out = np.empty(n, dtype=x.dtype)
+        total = 0.0
+        n_nan = 0
+        
+        for i in range(n):
+            # Add the incoming value
+            value = x[i]
+            if not np.isfinite(value):
+                n_nan += 1
+            else:
+                total += value
+            
+            # Subtract the value that just left the window
+            if i >= window:
+                expired = x[i - window]
+                if not np.isfinite(expired):
+                    n_nan -= 1
+                else:
+                    total -= expired
+            
+            # Only full, NaN-free windows have a value
+            if i >= window - 1 and n_nan == 0:
+                out[i] = total / divisor
+            else:
+                out[i] = np.nan
+        
+        return out
+    
+    @njit(cache=True)
+    def _rolling_sum_nb(x, window):
+        """Running-sum kernel for any window (see _rolling_sum_impl)."""
+        return _rolling_sum_impl(x, window, 1.0)
+    
+    # Fixed-window moving averages for the windows the pipeline uses.
+    # The window is a compile-time constant; cache=True keeps the machine
+    # code on disk, so later runs have no first-call JIT latency.
+    # No fastmath, here or anywhere in this module: it lets LLVM assume
+    # there is no NaN/inf and fold away the np.isfinite() checks the windows
+    # depend on (and reassociating the running sum changes the results)
+    @njit(cache=True)
+    def _sma5_nb(x):
+        """5-row moving average (specialized _rolling_sum_impl)."""
+        return _rolling_sum_impl(x, 5, 5.0)
+    
+    @njit(cache=True)
+    def _sma20_nb(x):
+        """20-row moving average (specialized _rolling_sum_impl)."""
+        return _rolling_sum_impl(x, 20, 20.0)
+    
+    @njit(parallel=True, cache=True)
+    def _rolling_sum_parallel_nb(x, window, n_chunks):
+        """
+        Multi-threaded running-sum kernel (same output as _rolling_sum_nb).
+        
+        The output is split into n_chunks contiguous blocks, one per
+        prange iteration. Each block first sums the window-1 values just
+        before it (the boundary fix-up), then slides exactly like the
+        serial kernel, so blocks are fully independent.
+        """
+        n = x.shape[0]
+        out = np.empty(n, dtype=x.dtype)
+        chunk = (n + n_chunks - 1) // n_chunks
+        
+        for k in prange(n_chunks):
+            start = k * chunk
+            stop = min(start + chunk, n)
+            first = max(start - window + 1, 0)   # Warm-up starts here
+            total = 0.0
+            n_nan = 0
+            
+            for i in range(first, stop):
+                # Add the incoming value
+                value = x[i]
+                if not np.isfinite(value):
+                    n_nan += 1
+                else:
+                    total += value
+                
+                # Subtract the value that just left the window
+                # (only if this block added it)
+                if i - window >= first:
+                    expired = x[i - window]
+                    if not np.isfinite(expired):
+                        n_nan -= 1
+                    else:
+                        total -= expired
+                
+                # Warm-up rows belong to the previous block
+                if i >= start:
+                    if i >= window - 1 and n_nan == 0:
+                        out[i] = total
+                    else:
+                        out[i] = np.nan
+        
+        return out
+    
+    @njit(cache=True)
+    def _rolling_mean_std_nb(x, window):
+        """
+        Rolling mean and sample std (ddof=1) in one pass.
+        
+        Uses Welford's update, extended to also REMOVE the value that
+        leaves the window. Unlike the textbook E[x^2] - E[x]^2 formula,
+        this does not lose precision when the values are large compared
+        to their spread (e.g. prices around 100 moving by 0.01).
+        
+        inf is skipped like NaN (the window gives NaN, as in pandas):
+        adding and removing inf would leave NaN in the running state
+        for the rest of the series.
+        """
+        n = x.shape[0]
+        out_mean = np.empty(n, dtype=x.dtype)
+        out_std = np.empty(n, dtype=x.dtype)
+        count = 0       # Finite values currently in the window
+        n_nan = 0       # NaN / inf values currently in the window
+        mean = 0.0
+        m2 = 0.0        # Sum of squared deviations from the mean
+        
+        for i in range(n):
+            # Add the incoming value
+            value = x[i]
+            if not np.isfinite(value):
+                n_nan += 1
+            else:
+                count += 1
+                delta = value - mean
+                mean += delta / count
+                m2 += delta * (value - mean)
+            
+            # Remove the value that just left the window
+            if i >= window:
+                expired = x[i - window]
+                if not np.isfinite(expired):
+                    n_nan -= 1
+                else:
+                    count -= 1
+                    if count == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        delta = expired - mean
+                        mean -= delta / count
+                        m2 -= delta * (expired - mean)
+            
+            # Only full windows of finite values have a value
+            if i >= window - 1 and n_nan == 0:
+                out_mean[i] = mean
+                if window > 1:
+                    out_std[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+                else:
+                    out_std[i] = np.nan
+            else:
+                out_mean[i] = np.nan
+                out_std[i] = np.nan
+        
+        return out_mean, out_std
+    
+    @njit(inline='always')
+    def _rolling_features_into(close, w_short, w_long, out_ret, out_short, out_long, out_vol):
+        """
+        Fused feature kernel body: ONE loop over close produces
+        daily return, MA(w_short), MA(w_long) and the sample std of
+        returns over w_long (Welford, as in _rolling_mean_std_nb),
+        written into the four given output arrays.
+        
+        Each close value is read once while it is in cache, instead of
+        once per feature; returns are computed on the fly. NaN and inf
+        closes are skipped by every running sum, as in _rolling_sum_impl.
+        """
+        n = close.shape[0]
+        
+        sum_short = 0.0
+        sum_long = 0.0
+        nan_short = 0
+        nan_long = 0
+        
+        # Welford state for the returns window
+        count = 0
+        nan_ret = 0
+        mean = 0.0
+        m2 = 0.0
+        
+        for i in range(n):
+            value = close[i]
+            is_bad = not np.isfinite(value)
+            
+            # ---- Moving averages: add incoming, subtract expired ----
+            if is_bad:
+                nan_short += 1
+                nan_long += 1
+            else:
+                sum_short += value
+                sum_long += value
+            
+            if i >= w_short:
+                expired = close[i - w_short]
+                if not np.isfinite(expired):
+                    nan_short -= 1
+                else:
+                    sum_short -= expired
+            if i >= w_long:
+                expired = close[i - w_long]
+                if not np.isfinite(expired):
+                    nan_long -= 1
+                else:
+                    sum_long -= expired
+            
+            if i >= w_short - 1 and nan_short == 0:
+                out_short[i] = sum_short / w_short
+            else:
+                out_short[i] = np.nan
+            if i >= w_long - 1 and nan_long == 0:
+                out_long[i] = sum_long / w_long
+            else:
+                out_long[i] = np.nan
+            
+            # ---- Daily return, computed on the fly ----
+            if i == 0:
+                ret = np.nan
+            else:
+                prev = close[i - 1]
+                if prev == 0.0:
+                    # Same as pct_change(): +/-inf, or NaN for 0/0
+                    ret = np.nan if value == 0.0 else np.sign(value) * np.inf
+                else:
+                    ret = (value - prev) / prev
+            out_ret[i] = ret
+            
+            # ---- Rolling std of returns (Welford add / remove) ----
+            # (inf returns after a zero close are skipped like NaN)
+            if not np.isfinite(ret):
+                nan_ret += 1
+            else:
+                count += 1
+                delta = ret - mean
+                mean += delta / count
+                m2 += delta * (ret - mean)
+            
+            if i >= w_long:
+                expired = out_ret[i - w_long]
+                if not np.isfinite(expired):
+                    nan_ret -= 1
+                else:
+                    count -= 1
+                    if count == 0:
+                        mean = 0.0
+                        m2 = 0.0
+                    else:
+                        delta = expired - mean
+                        mean -= delta / count
+                        m2 -= delta * (expired - mean)
+            
+            if i >= w_long - 1 and nan_ret == 0 and w_long > 1:
+                out_vol[i] = np.sqrt(max(m2, 0.0) / (w_long - 1))
+            else:
+                out_vol[i] = np.nan
+    
+    @njit(inline='always')
+    def _rolling_features_impl(close, w_short, w_long):
+        """Fused feature kernel into new arrays (see _rolling_features_into)."""
+        n = close.shape[0]
+        out_ret = np.empty(n, dtype=close.dtype)
+        out_short = np.empty(n, dtype=close.dtype)
+        out_long = np.empty(n, dtype=close.dtype)
+        out_vol = np.empty(n, dtype=close.dtype)
+        _rolling_features_into(close, w_short, w_long, out_ret, out_short, out_long, out_vol)
+        return out_ret, out_short, out_long, out_vol
+    
+    @njit(cache=True)
+    def _rolling_features_nb(close, w_short, w_long):
+        """Fused feature kernel for any windows (see _rolling_features_impl)."""
+        return _rolling_features_impl(close, w_short, w_long)
+    
+    @njit(cache=True)
+    def _features_5_20_nb(close):
+        """Fused feature kernel specialized for the pipeline's 5/20 windows."""
+        return _rolling_features_impl(close, 5, 20)
+    
+    @njit(parallel=True, cache=True)
+    def _rolling_features_2d_nb(close, w_short, w_long):
+        """
+        Fused feature kernel for every row of a 2-D close array.
+        
+        Rows (symbols) are independent, so they are spread across all
+        cores with prange; each row runs the serial fused loop.
+        """
+        out_ret = np.empty_like(close)
+        out_short = np.empty_like(close)
+        out_long = np.empty_like(close)
+        out_vol = np.empty_like(close)
+        for s in prange(close.shape[0]):
+            _rolling_features_into(
+                close[s], w_short, w_long,
+                out_ret[s], out_short[s], out_long[s], out_vol[s]
+            )
+        return out_ret, out_short, out_long, out_vol
+    
+    # Specialized kernels by (kind, windows...). Anything not listed
+    # here goes through the generic kernels above. (Numba itself keeps
+    # one compiled version per input dtype, float64 / float32.)
+    _KERNEL_CACHE = {
+        ('mean', 5): _sma5_nb,
+        ('mean', 20): _sma20_nb,
+        ('features', 5, 20): _features_5_20_nb,
+    }
+else:
+    _KERNEL_CACHE = {}
+
+
+# ================================================================
+# NUMPY FALLBACKS (no Numba)
+# ================================================================
+
+def _rolling_sum_cumsum(arr: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sum from prefix sums: sum(x[i-w+1..i]) = cs[i+1] - cs[i+1-w].
+    
+    Two np.cumsum passes (values with NaN/inf zeroed, and a count of
+    them) and one vectorized subtraction; windows containing NaN or inf
+    become NaN. The prefix sums are float64 even for float32 input.
+    """
+    n = arr.shape[0]
+    out = np.full(n, np.nan, dtype=arr.dtype)
+    if n < window:
+        return out
+    
+    bad = ~np.isfinite(arr)
+    cs = np.zeros(n + 1)
+    np.cumsum(np.where(bad, 0.0, arr), out=cs[1:])
+    n_bad = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(bad, out=n_bad[1:])
+    
+    sums = cs[window:] - cs[:-window]
+    sums[(n_bad[window:] - n_bad[:-window]) > 0] = np.nan
+    out[window - 1:] = sums
+    return out
+
+
+def _rolling_mean_std_cumsum(arr: np.ndarray, window: int):
+    """
+    Rolling mean and sample std (ddof=1) from prefix sums of d and d^2.
+    
+    var = (sum(d^2) - sum(d)^2 / w) / (w - 1), with d = x - shift.
+    The sum-of-squares formula cancels catastrophically when the values
+    are far from `shift` compared with their spread (prices around 1e8
+    moving by 0.01, or a long trending series), and prefix sums over the
+    whole series grow until their differences lose the small window
+    sums. So the windows are computed in blocks of _CUMSUM_BLOCK rows:
+    each block has its own short prefix sums, centred on the block's own
+    mean, which follows any drift or trend. NaN and inf are skipped like
+    in _rolling_mean_std_nb.
+    """
+    n = arr.shape[0]
+    out_mean = np.full(n, np.nan, dtype=arr.dtype)
+    out_std = np.full(n, np.nan, dtype=arr.dtype)
+    if n < window:
+        return out_mean, out_std
+    
+    bad = ~np.isfinite(arr)
+    n_bad = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(bad, out=n_bad[1:])
+    
+    # Windows ending at rows [end, end + _CUMSUM_BLOCK) need the rows
+    # from end - window + 1 on
+    for end in range(window - 1, n, _CUMSUM_BLOCK):
+        start = end - window + 1
+        stop = min(end + _CUMSUM_BLOCK, n)
+        x = arr[start:stop]
+        x_bad = bad[start:stop]
+        
+        finite = x[~x_bad]
+        shift = float(finite.mean(dtype=np.float64)) if finite.size else 0.0
+        with np.errstate(invalid='ignore'):
+            d = np.where(x_bad, 0.0, np.subtract(x, shift, dtype=np.float64))
+        
+        cs = np.zeros(d.size + 1)
+        np.cumsum(d, out=cs[1:])
+        cs2 = np.zeros(d.size + 1)
+        np.cumsum(d * d, out=cs2[1:])
+        
+        s1 = cs[window:] - cs[:-window]
+        s2 = cs2[window:] - cs2[:-window]
+        ok = (n_bad[end + 1:stop + 1] - n_bad[start:stop - window + 1]) == 0
+        
+        out_mean[end:stop] = np.where(ok, s1 / window + shift, np.nan)
+        if window > 1:
+            var = np.maximum(s2 - s1 * s1 / window, 0.0) / (window - 1)
+            out_std[end:stop] = np.where(ok, np.sqrt(var), np.nan)
+    
+    return out_mean, out_std
+
+
+def _rolling_mean_bn(arr: np.ndarray, window: int) -> np.ndarray:
+    """
+    Moving average with Bottleneck's move_mean (no-Numba fallback).
+    
+    Bottleneck keeps its running sum in the input dtype, which drifts
+    badly over long float32 series, so float32 input is averaged in
+    float64 and the result cast back. Bottleneck only skips NaN: inf
+    is replaced by NaN first, so the windows after it recover.
+    """
+    values = arr.astype(np.float64, copy=False)
+    is_inf = np.isinf(values)
+    if is_inf.any():
+        values = np.where(is_inf, np.nan, values)
+    means = bn.move_mean(values, window, min_count=window)
+    return means.astype(arr.dtype, copy=False)
+
+
+# ================================================================
+# PUBLIC FUNCTIONS
+# ================================================================
+
+def as_float_array(x) -> np.ndarray:
+    """
+    Convert array-like input to a contiguous float NumPy array.
+    
+    float32 input is kept as float32; everything else becomes float64.
+    No copy is made when x already is a contiguous array of that dtype.
+    """
+    arr = np.asarray(x)
+    dtype = np.float32 if arr.dtype == np.float32 else np.float64
+    return np.ascontiguousarray(arr, dtype=dtype)
+
+
+def rolling_sum(x, window: int) -> np.ndarray:
+    """
+    Rolling sum over the last `window` values (current value included).
+    
+    Args:
+        x: 1-D array-like of numbers
+        window: Window length (>= 1)
+        
+    Returns:
+        NumPy array, same length as x (float32 for float32 input,
+        float64 otherwise). The first window-1 entries (and any window
+        containing NaN or inf) are NaN.
+        
+    Raises:
+        ValueError: If window < 1
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    
+    arr = as_float_array(x)
+    
+    if NUMBA_AVAILABLE:
+        if arr.size >= PARALLEL_MIN_SIZE:
+            return _rolling_sum_parallel_nb(arr, window, get_num_threads())
+        return _rolling_sum_nb(arr, window)
+    
+    return _rolling_sum_cumsum(arr, window)
+
+
+def rolling_mean(x, window: int) -> np.ndarray:
+    """
+    Simple moving average over the last `window` values.
+    
+    Args:
+        x: 1-D array-like of numbers
+        window: Window length (>= 1)
+        
+    Returns:
+        NumPy array, same length and dtype as rolling_sum (first
+        window-1 entries NaN)
+        
+    Raises:
+        ValueError: If window < 1
+        
+    Example:
+        ma10 = rolling_mean(df['close'], 10)
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    
+    arr = as_float_array(x)
+    
+    # Windows with a specialized (fixed-window) kernel skip the generic path
+    if NUMBA_AVAILABLE and arr.size < PARALLEL_MIN_SIZE:
+        kernel = _KERNEL_CACHE.get(('mean', window))
+        if kernel is not None:
+            return kernel(arr)
+    
+    # Bottleneck rejects windows longer than the series (all NaN anyway)
+    if not NUMBA_AVAILABLE and BOTTLENECK_AVAILABLE and window <= arr.size:
+        return _rolling_mean_bn(arr, window)
+    
+    return rolling_sum(arr, window) / window
+
+
+def rolling_mean_std(x, window: int):
+    """
+    Rolling mean and rolling standard deviation, computed together.
+    
+    Args:
+        x: 1-D array-like of numbers
+        window: Window length (>= 1)
+        
+    Returns:
+        Tuple (mean, std) of NumPy arrays, same length as x (float32
+        for float32 input, float64 otherwise).
+        std is the SAMPLE standard deviation (ddof=1), the same as
+        pandas rolling().std(). Incomplete windows and windows
+        containing NaN or inf are NaN.
+        
+    Raises:
+        ValueError: If window < 1
+        
+    Example:
+        ma20, vol20 = rolling_mean_std(df['close'], 20)
+    """
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    
+    arr = as_float_array(x)
+    
+    if NUMBA_AVAILABLE:
+        return _rolling_mean_std_nb(arr, window)
+    
+    return _rolling_mean_std_cumsum(arr, window)
+
+
+def daily_return(close) -> np.ndarray:
+    """
+    Daily return of a close-price series: (close[t] - close[t-1]) / close[t-1].
+    
+    Args:
+        close: 1-D array-like of prices
+        
+    Returns:
+        NumPy array, same length and float dtype as close.
+        The first element is NaN (no previous day); a zero previous
+        close gives inf, the same values as pandas pct_change().
+    """
+    arr = as_float_array(close)
+    # Two in-place ufunc passes, no shifted copy: subtract, then divide.
+    # (The difference is exact for nearby prices, so small returns keep
+    # more precision than close[t] / close[t-1] - 1.)
+    r = np.empty_like(arr)
+    r[:1] = np.nan
+    np.subtract(arr[1:], arr[:-1], out=r[1:])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r[1:] /= arr[:-1]
+    return r
+
+
+def rolling_features(close, w_short: int = 5, w_long: int = 20):
+    """
+    Daily return, short/long moving averages and rolling volatility.
+    
+    Args:
+        close: 1-D array-like of close prices
+        w_short: Short moving-average window (default 5)
+        w_long: Long moving-average AND volatility window (default 20)
+        
+    Returns:
+        Tuple (daily_return, ma_short, ma_long, vol_long) of NumPy
+        arrays, same length as close (float32 for float32 input,
+        float64 otherwise). vol_long is the sample std (ddof=1) of
+        daily_return over w_long rows.
+        
+    Raises:
+        ValueError: If a window is < 1
+        
+    Note:
+        With Numba this is ONE pass over close (all four features are
+        updated in the same loop), using a kernel compiled for the
+        exact windows when one is in _KERNEL_CACHE (5/20); the fallback
+        runs the separate kernels above.
+        
+    Example:
+        ret, ma5, ma20, vol20 = rolling_features(df['close'], 5, 20)
+    """
+    if w_short < 1 or w_long < 1:
+        raise ValueError(f"windows must be >= 1, got {w_short} and {w_long}")
+    
+    arr = as_float_array(close)
+    
+    if NUMBA_AVAILABLE:
+        kernel = _KERNEL_CACHE.get(('features', w_short, w_long))
+        if kernel is not None:
+            return kernel(arr)
+        return _rolling_features_nb(arr, w_short, w_long)
+    
+    ret = daily_return(arr)
+    ma_short = rolling_mean(arr, w_short)
+    ma_long = rolling_mean(arr, w_long)
+    _, vol_long = rolling_mean_std(ret, w_long)
+    return ret, ma_short, ma_long, vol_long
+
+
+def rolling_features_2d(close, w_short: int = 5, w_long: int = 20):
+    """
+    rolling_features() for many series at once, one series per row.
+    
+    Args:
+        close: 2-D array-like of close prices, shape (n_symbols, n_days)
+        w_short: Short moving-average window (default 5)
+        w_long: Long moving-average AND volatility window (default 20)
+        
+    Returns:
+        Tuple (daily_return, ma_short, ma_long, vol_long) of 2-D NumPy
+        arrays, same shape as close; row s holds rolling_features(close[s]).
+        
+    Raises:
+        ValueError: If close is not 2-D or a window is < 1
+        
+    Note:
+        With Numba the rows are processed in parallel on all cores
+        (prange over symbols); the fallback runs rolling_features() on
+        one row after the other.
+        
+    Example:
+        ret, ma5, ma20, vol20 = rolling_features_2d(close_matrix)
+    """
+    if w_short < 1 or w_long < 1:
+        raise ValueError(f"windows must be >= 1, got {w_short} and {w_long}")
+    
+    arr = as_float_array(close)
+    if arr.ndim != 2:
+        raise ValueError(f"close must be 2-D (symbols x days), got {arr.ndim}-D")
+    
+    if NUMBA_AVAILABLE:
+        return _rolling_features_2d_nb(arr, w_short, w_long)
+    
+    outputs = tuple(np.empty_like(arr) for _ in range(4))
+    for s in range(arr.shape[0]):
+        for out, row in zip(outputs, rolling_features(arr[s], w_short, w_long)):
+            out[s] = row
+    return outputs
@@ -1,27 +1,32 @@
 """
 metrics.py - 量化指标计算工具
 提供均值、标准差、最大回撤等计算函数
+
+所有函数都接受「类数组」输入（列表、NumPy 数组、pandas Series），
+内部统一转换为 float64 的 NumPy 数组，用向量化运算代替 Python 循环。
 """
 
+import numpy as np
+
 
 def mean(x):
     """
     计算均值（平均数）
     
     参数:
-        x: 数字列表，如 [1, 2, 3]
+        x: 数字序列，如 [1, 2, 3] 或 NumPy 数组
         
     返回:
         float: 均值
     """
+    arr = np.asarray(x, dtype=np.float64)
+    
     # 边界情况：空列表
-    if len(x) == 0:
+    if arr.size == 0:
         return 0.0
     
-    # 求和 / 个数
-    total = sum(x)
-    count = len(x)
-    return total / count
+    # 向量化求平均（底层是 C 循环，不经过 Python 解释器）
+    return float(arr.mean())
 
 
 def std(x):
@@ -29,33 +34,25 @@ def std(x):
     计算总体标准差
     
     参数:
-        x: 数字列表
+        x: 数字序列
         
     返回:
         float: 标准差
         
     注意:
-        这里用的是「总体标准差」，除以 n
+        这里用的是「总体标准差」，除以 n（ddof=0）
         （另一种「样本标准差」是除以 n-1）
     """
+    arr = np.asarray(x, dtype=np.float64)
+    
     # 边界情况
-    if len(x) == 0:
+    if arr.size == 0:
         return 0.0
-    if len(x) == 1:
+    if arr.size == 1:
         return 0.0
     
-    # 1. 计算均值
-    avg = mean(x)
-    
-    # 2. 计算每个值与均值的差的平方
-    squared_diffs = [(val - avg) ** 2 for val in x]
-    
-    # 3. 求平均（方差）
-    variance = sum(squared_diffs) / len(x)
-    
-    # 4. 开根号得到标准差
-    result = variance ** 0.5
-    return result
+    # ddof=0 即总体标准差
+    return float(arr.std())
 
 
 def max_drawdown(nav_series):
@@ -69,31 +66,28 @@ def max_drawdown(nav_series):
         float: 最大回撤比例（0到1之间）
         
     原理:
-        遍历每个点，记录到目前为止的最高点（峰值）
-        计算当前点相对于峰值的跌幅
+        用 np.fmax.accumulate 一次性得到「到目前为止的最高点（峰值）」序列
+        计算每个点相对于峰值的跌幅
         取所有跌幅中的最大值
+        
+    说明:
+        NaN（缺失的净值）会被跳过：fmax 忽略 NaN，不会把 NaN 传播到
+        后面所有的峰值（np.maximum.accumulate 会），NaN 的位置回撤记为 0
     """
+    arr = np.asarray(nav_series, dtype=np.float64)
+    
     # 边界情况
-    if len(nav_series) == 0:
+    if arr.size == 0:
         return 0.0
-    if len(nav_series) == 1:
+    if arr.size == 1:
         return 0.0
     
-    max_dd = 0.0      # 最大回撤（初始为0）
-    peak = nav_series[0]  # 历史最高点（初始为第一个值）
+    # 历史最高点序列（累计最大值，跳过 NaN）
+    peaks = np.fmax.accumulate(arr)
     
-    # 遍历每个净值
-    for nav in nav_series:
-        # 如果当前值比之前的最高点还高，更新最高点
-        if nav > peak:
-            peak = nav
-        
-        # 计算当前回撤：(最高点 - 当前值) / 最高点
-        if peak > 0:  # 避免除以0
-            drawdown = (peak - nav) / peak
-            
-            # 如果这次回撤更大，更新最大回撤
-            if drawdown > max_dd:
-                max_dd = drawdown
+    # 当前回撤：(最高点 - 当前值) / 最高点
+    # 峰值 <= 0（避免除以0）或当前值是 NaN 的位置不计算，回撤记为 0
+    drawdowns = np.zeros_like(arr)
+    np.divide(peaks - arr, peaks, out=drawdowns, where=(peaks > 0) & ~np.isnan(arr))
     
-    return max_dd
+    return float(drawdowns.max())
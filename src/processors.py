@@ -9,9 +9,273 @@ This module provides tools for:
 Author: [Your Name]
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from typing import Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
+
+from src.config import OHLCV_DTYPES
+from src.kernels import as_float_array, rolling_features, rolling_features_2d
+
+
+# Copy-on-Write (the default from pandas 3.0 on): frames that share data
+# are only copied when one of them is actually modified, so DataProcessor
+# can wrap the caller's DataFrame without duplicating it up front
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+# Rows of history the longest feature needs: Vol_20 = std of 20 returns,
+# and 20 returns need 21 close prices
+FEATURE_LOOKBACK = 21
+
+# Columns generated by add_features()
+FEATURE_COLUMNS = ('daily_return', 'MA5', 'MA20', 'Vol_20')
+
+# Default rows per Parquet row group. Each row group stores min/max
+# statistics per column, so readers filtering on e.g. 'date' can skip
+# whole row groups; smaller groups prune finer, larger ones compress better
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+# Columns that readers filter on. Only these get dictionary encoding and
+# min/max statistics; the float price/feature columns are high-cardinality
+# and never used as predicates, so their statistics are just overhead
+PARQUET_FILTER_COLUMNS = ('date', 'symbol')
+
+
+def _arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Build an Arrow table column by column, straight from the column arrays.
+    
+    NumPy numeric/datetime columns are wrapped zero-copy, with the Arrow
+    type taken from the dtype (NaN becomes null, as with
+    Table.from_pandas, which only adds a validity bitmap). Object
+    columns (strings, dates, ...) are converted once, inferring their
+    type from the values, and pandas extension dtypes (e.g. nullable
+    Int64) convert themselves. The schema is taken from the converted
+    arrays, so no column is converted twice.
+    
+    Args:
+        df: DataFrame to convert
+        
+    Returns:
+        pyarrow Table, with the pandas metadata attached (from an empty
+        slice), so read_parquet() restores the same dtypes
+    """
+    arrays = []
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biufM':
+            arrays.append(pa.array(df[col], type=pa.from_numpy_dtype(dtype), from_pandas=True))
+        else:
+            arrays.append(pa.array(df[col], from_pandas=True))
+    
+    schema = pa.schema([pa.field(str(col), arr.type) for col, arr in zip(df.columns, arrays)])
+    schema = pa.RecordBatch.from_pandas(df.iloc[:0], schema=schema, preserve_index=False).schema
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _parquet_filter_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Get the PARQUET_FILTER_COLUMNS present in a DataFrame.
+    
+    Args:
+        df: DataFrame about to be written
+        
+    Returns:
+        Column names to dictionary-encode and write statistics for
+    """
+    return [col for col in PARQUET_FILTER_COLUMNS if col in df.columns]
+
+
+def _downcast_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast the feature columns to float32 for storage.
+    
+    Derived features don't need float64's range or precision (float32
+    keeps ~7 significant digits), and float32 halves the bytes written
+    and read back. OHLCV columns keep their dtypes so prices round-trip
+    exactly.
+    
+    Args:
+        df: Processed DataFrame
+        
+    Returns:
+        Shallow copy with float32 feature columns (df itself if there is
+        nothing to cast)
+    """
+    casts = {
+        col: np.float32 for col in FEATURE_COLUMNS
+        if col in df.columns and df[col].dtype != np.float32
+    }
+    if not casts:
+        return df
+    return df.astype(casts)
+
+
+def _is_date_only(dates: pd.Series) -> bool:
+    """True if every (non-missing) timestamp is exactly midnight."""
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    values = values[~np.isnat(values)]
+    return bool((values.astype('datetime64[D]') == values).all())
+
+
+def _date_values(dates: pd.Series) -> np.ndarray:
+    """
+    Get a date column as a NumPy array that sorts like the dates.
+    
+    datetime64 columns (tz-aware too, as UTC) become datetime64[ns],
+    where NaT sorts last; anything else is returned as is.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates.to_numpy(dtype='datetime64[ns]')
+    return dates.to_numpy()
+
+
+def _first_of_each_date(sorted_dates: pd.Series) -> np.ndarray:
+    """
+    Mark the first row of each date in a date-sorted column.
+    
+    Sorted duplicates are adjacent, so for datetime64 columns one
+    vectorized compare of each int64 timestamp with its predecessor
+    replaces hashing every value (NaT is a valid int64 sentinel, so
+    repeated NaT rows count as duplicates too, like duplicated()).
+    Other dtypes use pandas' hash-based check.
+    
+    Args:
+        sorted_dates: Date column, sorted ascending
+        
+    Returns:
+        Bool array, True for rows to keep
+    """
+    values = _date_values(sorted_dates)
+    if values.dtype.kind != 'M':
+        return ~sorted_dates.duplicated(keep='first').to_numpy()
+    
+    ints = values.view(np.int64)
+    keep = np.empty(len(ints), dtype=bool)
+    keep[:1] = True
+    np.not_equal(ints[1:], ints[:-1], out=keep[1:])
+    return keep
+
+
+def _float_csv_text(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Format a float column for CSV the way DataFrame.to_csv() does.
+    
+    Arrow writes whole floats as '1', which a reader infers as an int
+    column; whole values get a '.0' appended ('1.0'). Nulls stay null.
+    """
+    text = pc.cast(column, pa.string())
+    whole = pc.match_substring_regex(text, r'^-?[0-9]+$')
+    return pc.if_else(whole, pc.binary_join_element_wise(text, '.0', ''), text)
+
+
+def _csv_needs_quoting(table: pa.Table, plain_columns: List[str]) -> bool:
+    """
+    True if any column name or text value must be quoted in a CSV file.
+    
+    Args:
+        table: Table about to be written
+        plain_columns: Text columns known to hold only plain values
+            (e.g. from _float_csv_text), which are not scanned
+    """
+    special = r'[",\r\n]'
+    if any(pc.match_substring_regex(name, special).as_py() for name in table.column_names):
+        return True
+    for field in table.schema:
+        if field.name in plain_columns:
+            continue
+        if pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            if pc.any(pc.match_substring_regex(table.column(field.name), special)).as_py():
+                return True
+    return False
+
+
+def _parse_dates(dates: pd.Series) -> pd.Series:
+    """
+    Parse a date column with the fast ISO-8601 parser.
+    
+    cache=True parses each distinct string once. Columns that are not
+    ISO-8601 (e.g. '01/02/2024') fall back to pandas' format inference.
+    """
+    try:
+        return pd.to_datetime(dates, format='ISO8601', cache=True)
+    except ValueError:
+        return pd.to_datetime(dates, cache=True)
+
+
+def _date_parse_options(input_path: str) -> Dict[str, List[str]]:
+    """
+    pd.read_csv() options that parse 'date' during the CSV scan.
+    
+    Only the header is read to check for the column: files without a
+    'date' column get no parse_dates (pandas would raise otherwise).
+    """
+    if 'date' in pd.read_csv(input_path, nrows=0).columns:
+        return {'parse_dates': ['date']}
+    return {}
+
+
+def _compute_features(close: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute all feature columns from the raw close-price array.
+    
+    One fused pass over close (src.kernels.rolling_features, with the
+    kernel compiled for the constant 5/20 windows when Numba is there):
+        daily_return = (close[t] - close[t-1]) / close[t-1]  (= pct_change())
+        MA5 / MA20   = mean of the last 5 / 20 close prices
+        Vol_20       = sample std (ddof=1) of the last 20 daily returns
+    
+    The first 4 rows of MA5, 19 rows of MA20 and 20 rows of Vol_20 are
+    NaN (not enough data) - correct behavior, NOT an error! Never use
+    rolling().apply(np.mean), which calls Python once per window.
+    
+    Returns:
+        Dict mapping feature column name to its array
+    """
+    daily_return, ma5, ma20, vol20 = rolling_features(close, 5, 20)
+    return {
+        'daily_return': daily_return,
+        'MA5': ma5,
+        'MA20': ma20,
+        'Vol_20': vol20,
+    }
+
+
+def compute_features_batch(close: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute the add_features() columns for many symbols at once.
+    
+    Args:
+        close: 2-D array of close prices, one symbol per row
+            (shape n_symbols x n_days, rows sorted by date)
+            
+    Returns:
+        Dict mapping feature column name to a 2-D array of the same
+        shape; row s is what add_features() computes for symbol s
+        
+    Note:
+        Symbols are independent, so with Numba the rows are processed
+        in parallel on all cores (src.kernels.rolling_features_2d),
+        instead of one DataProcessor per symbol after the other.
+        
+    Example:
+        features = compute_features_batch(close_matrix)
+        ma20 = features['MA20'][0]   # MA20 of the first symbol
+    """
+    daily_return, ma5, ma20, vol20 = rolling_features_2d(close, 5, 20)
+    return {
+        'daily_return': daily_return,
+        'MA5': ma5,
+        'MA20': ma20,
+        'Vol_20': vol20,
+    }
 
 
 class DataProcessor:
@@ -31,22 +295,77 @@ class DataProcessor:
         processor.save_to_parquet('output.parquet')
     """
     
-    def __init__(self, df: pd.DataFrame):
+    # Numeric columns exported by to_soa() / to_matrix()
+    NUMERIC_COLUMNS = [
+        'open', 'high', 'low', 'close', 'volume',
+        'daily_return', 'MA5', 'MA20', 'Vol_20'
+    ]
+    
+    def __init__(
+        self,
+        df: Union[pd.DataFrame, Dict[str, Any]],
+        copy: bool = False,
+        downcast: bool = False
+    ):
         """
         Initialize the processor with a DataFrame.
         
         Args:
-            df: Raw DataFrame containing OHLCV data
+            df: Raw DataFrame containing OHLCV data, or a dict mapping
+                column names to arrays/lists (wrapped without copying)
+            copy: Deep-copy the data up front (default False)
+            downcast: Store prices as float32 and volume as the smallest
+                unsigned integer that fits (default False)
             
         Note:
-            A copy is made to avoid modifying the original data.
+            The original data is never modified. With Copy-on-Write the
+            processor shares the caller's column buffers and only copies
+            a column when it is first changed, so no copy is needed
+            unless copy=True is asked for explicitly.
         """
-        # Make a copy to avoid modifying original data
-        self.df = df.copy()
+        # Plain columns: build the frame around the arrays directly
+        # (copy=False: no consolidation into one 2-D block). Copy-on-Write
+        # only protects data another pandas object still references, so
+        # the wrapper is kept: writes to self.df then copy instead of
+        # changing the caller's arrays
+        self._source: Optional[pd.DataFrame] = None
+        if isinstance(df, dict):
+            df = self._source = pd.DataFrame(df, copy=False)
         
-        # Convert date column to datetime if it exists
-        if 'date' in self.df.columns:
-            self.df['date'] = pd.to_datetime(self.df['date'])
+        # A new DataFrame object either way: in-place cleaning on
+        # self.df must never touch the caller's object
+        self.df = df.copy(deep=copy)
+        
+        # Convert date column to datetime if it exists, once, up front:
+        # sorting and dedupe in clean() then hash/compare raw int64
+        # timestamps instead of Python strings. Skipped when the loader
+        # already parsed the dates (e.g. io_utils.load_ohlcv).
+        # (assign builds a new frame, the caller's date column is untouched)
+        if 'date' in self.df.columns and not pd.api.types.is_datetime64_any_dtype(self.df['date']):
+            self.df = self.df.assign(date=_parse_dates(self.df['date']))
+        
+        if downcast:
+            self._downcast()
+    
+    def _downcast(self):
+        """
+        Shrink the numeric columns to halve the bytes every pass reads.
+        
+        Prices become float32 (~7 significant digits, plenty for prices),
+        and the features computed from them are then float32 too.
+        Volume becomes the smallest unsigned integer type that holds it
+        (left unchanged if it has negative or non-integer values).
+        """
+        columns = {
+            col: self.df[col].astype(np.float32)
+            for col in ('open', 'high', 'low', 'close')
+            if col in self.df.columns
+        }
+        if 'volume' in self.df.columns:
+            columns['volume'] = pd.to_numeric(self.df['volume'], downcast='unsigned')
+        
+        # One assign for all columns instead of one block rewrite per column
+        self.df = self.df.assign(**columns)
     
     # ================================================================
     # CLEANING METHODS
@@ -57,55 +376,108 @@ class DataProcessor:
         Clean the data by handling missing values and duplicates.
         
         Steps:
-            1. Forward fill (ffill): Use previous day's value
-            2. Backward fill (bfill): For NaN at the beginning
-            3. Remove duplicate dates
+            1. Sort by date (stable, so duplicates keep their file order),
+               dropping rows with a missing date
+            2. Remove duplicate dates
+            3. Forward fill (ffill): Use previous day's value
+            4. Backward fill (bfill): For NaN at the beginning
         
         Returns:
             self: For method chaining
             
+        Note:
+            Every step touches only what it has to (one row selection,
+            then only the columns with missing values), so cleaning makes
+            no full-size intermediate DataFrames, and a step is skipped
+            entirely when the data does not need it. Sorting first means
+            the fills propagate values in date order, not file order.
+            
         Example:
             processor.clean().add_features()
         """
-        # Step 1: Handle missing values
-        self._fill_missing_values()
+        # Cheap checks first: each step only runs if the data needs it.
+        # Already-clean data (e.g. incremental appends) is only scanned,
+        # never rewritten
+        
+        # Steps 1 + 2: Sort by date and remove duplicate dates,
+        # as ONE row selection (a single take() instead of two copies)
+        if 'date' in self.df.columns:
+            self._sort_and_remove_duplicates()
         
-        # Step 2: Remove duplicate dates
-        self._remove_duplicates()
+        # The row selection leaves gaps in the index: renumber 0..n-1
+        if not self.df.index.equals(pd.RangeIndex(len(self.df))):
+            self.df.reset_index(drop=True, inplace=True)
         
-        # Step 3: Sort by date
-        self._sort_by_date()
+        # Step 3: Handle missing values, only in the columns that have any
+        has_na = self.df.isna().to_numpy().any(axis=0)
+        if has_na.any():
+            self._fill_missing_values(list(self.df.columns[has_na]))
         
         return self  # Enable method chaining
     
-    def _fill_missing_values(self):
+    def _fill_missing_values(self, columns: List[str]):
         """
         Fill missing values using forward fill, then backward fill.
         
+        Args:
+            columns: Columns that contain missing values
+            
         Why this order?
             - ffill: If today's data is missing, use yesterday's
             - bfill: If the first row is missing, use the next available
+            
+        Note:
+            Only the given columns are filled and replaced; every other
+            column keeps sharing its buffer (e.g. with the caller's
+            DataFrame), instead of the whole frame being rewritten.
         """
         # Forward fill: propagate last valid value forward
-        self.df = self.df.ffill()
-        
         # Backward fill: fill remaining NaN at the beginning
-        self.df = self.df.bfill()
-    
-    def _remove_duplicates(self):
-        """
-        Remove duplicate dates, keeping the first occurrence.
-        """
-        if 'date' in self.df.columns:
-            # Keep first occurrence of each date
-            self.df = self.df.drop_duplicates(subset='date', keep='first')
+        filled = self.df[columns].ffill().bfill()
+        
+        # Replace all filled columns at once (self.df is our own object:
+        # with Copy-on-Write this never writes into the caller's data)
+        self.df[columns] = filled
     
-    def _sort_by_date(self):
+    def _sort_and_remove_duplicates(self):
         """
-        Sort DataFrame by date in ascending order.
+        Sort by date (ascending) and keep the first row of each date.
+        
+        Rows with a missing date are dropped.
+        
+        The row order and the duplicate mask are computed on the date
+        array alone (after sorting, duplicates are found by comparing
+        neighbours, without hashing); the DataFrame is then copied at
+        most once, with a single take() of the surviving rows in date
+        order.
+        
+        The sort is stable: rows with the same date keep their original
+        order, so "keep first" still means first in file.
         """
-        if 'date' in self.df.columns:
-            self.df = self.df.sort_values('date').reset_index(drop=True)
+        dates = self.df['date']
+        positions = None   # Row positions to keep (None = all, in order)
+        
+        # Rows without a date have no place in date order: drop them
+        # (forward-filling the date would copy a neighbour's date and
+        # leave a duplicate behind)
+        missing = dates.isna().to_numpy()
+        if missing.any():
+            positions = np.flatnonzero(~missing)
+            dates = dates.take(positions)
+        
+        # Sort the date array only (not the whole frame), if needed
+        if not dates.is_monotonic_increasing:
+            order = np.argsort(_date_values(dates), kind='stable')
+            positions = order if positions is None else positions[order]
+            dates = dates.take(order)
+        
+        # Duplicate dates: now adjacent, keep the first of each run
+        keep = _first_of_each_date(dates)
+        if not keep.all():
+            positions = positions[keep] if positions is not None else np.flatnonzero(keep)
+        
+        if positions is not None:
+            self.df = self.df.take(positions)
     
     # ================================================================
     # FEATURE ENGINEERING METHODS
@@ -125,79 +497,77 @@ class DataProcessor:
             self: For method chaining
             
         Note:
-            All calculations use vectorized operations (no for loops).
-            No look-ahead bias: only past data is used.
+            All four features come from a single O(N) pass over the raw
+            close array (src.kernels.rolling_features, Numba-compiled
+            when available). No look-ahead bias: only past data is used.
         """
-        # Step 1: Calculate daily return
-        self._add_daily_return()
-        
-        # Step 2: Add moving averages
-        self._add_moving_averages()
-        
-        # Step 3: Add volatility
-        self._add_volatility()
+        # Pull the close prices out of the DataFrame ONCE, compute every
+        # feature from that raw array, and insert all feature columns in
+        # one assign (instead of one block-manager insert per column)
+        close = as_float_array(self.df['close'])
+        self.df = self.df.assign(**_compute_features(close))
         
         return self  # Enable method chaining
     
-    def _add_daily_return(self):
-        """
-        Calculate daily return: (today - yesterday) / yesterday
-        
-        Uses pct_change() which is equivalent to:
-            (close[t] - close[t-1]) / close[t-1]
-        """
-        # pct_change() calculates percentage change from previous row
-        # This is safe: no look-ahead bias (only looks at past)
-        self.df['daily_return'] = self.df['close'].pct_change()
-    
-    def _add_moving_averages(self):
-        """
-        Calculate Simple Moving Averages (SMA).
-        
-        MA5:  Average of last 5 days' close prices
-        MA20: Average of last 20 days' close prices
-        
-        Note:
-            - First 4 rows of MA5 will be NaN (not enough data)
-            - First 19 rows of MA20 will be NaN
-            - This is correct behavior, NOT an error!
-        """
-        # 5-day moving average
-        # rolling(window=5) looks at current row + 4 previous rows
-        self.df['MA5'] = self.df['close'].rolling(window=5).mean()
-        
-        # 20-day moving average
-        self.df['MA20'] = self.df['close'].rolling(window=20).mean()
-    
-    def _add_volatility(self):
-        """
-        Calculate 20-day rolling volatility.
-        
-        Volatility = Standard deviation of daily returns over 20 days
-        
-        High volatility = prices are jumping around a lot
-        Low volatility = prices are relatively stable
-        """
-        # Calculate std of daily returns over 20-day window
-        self.df['Vol_20'] = self.df['daily_return'].rolling(window=20).std()
-    
     # ================================================================
     # STORAGE METHODS
     # ================================================================
     
-    def save_to_parquet(self, path: str) -> None:
+    def save_to_parquet(
+        self,
+        path: str,
+        compression: str = 'zstd',
+        row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+        compression_level: Optional[int] = None,
+        float32_features: bool = True
+    ) -> None:
         """
         Save the processed DataFrame to a Parquet file.
         
         Args:
             path: Output file path (e.g., 'data/processed/output.parquet')
+            compression: Parquet compression codec (default 'zstd')
+            row_group_size: Rows per row group (default PARQUET_ROW_GROUP_SIZE)
+            compression_level: Codec level (None = 3 for zstd, codec
+                default otherwise)
+            float32_features: Store the feature columns as float32
+                (default True); False writes them unchanged
             
         Why Parquet?
             - 10-100x faster than CSV for large files
             - Compressed: smaller file size
             - Preserves data types (dates, floats, etc.)
+            
+        Note:
+            The Arrow table is built directly from the column arrays
+            (zero-copy for numeric columns, see _arrow_table) and written
+            through a ParquetWriter in row groups of row_group_size rows.
+            Every row group gets min/max statistics for the filter columns
+            (PARQUET_FILTER_COLUMNS), which lets readers skip row groups
+            outside a date filter.
         """
-        self.df.to_parquet(path, index=False)
+        # zstd level 3: about snappy's write speed, noticeably smaller files
+        if compression_level is None and compression == 'zstd':
+            compression_level = 3
+        
+        df = _downcast_for_parquet(self.df) if float32_features else self.df
+        
+        # Arrow types come from the column dtypes: Arrow does not have to
+        # re-infer types from the data, the buffers are converted directly
+        table = _arrow_table(df)
+        filter_columns = _parquet_filter_columns(df)
+        
+        with pq.ParquetWriter(
+            path,
+            table.schema,
+            compression=compression,
+            compression_level=compression_level,
+            use_dictionary=filter_columns,      # Prices are high-cardinality floats
+            write_statistics=filter_columns     # min/max per row group for pruning
+        ) as writer:
+            # The writer cuts the table into row groups (zero-copy slices)
+            writer.write_table(table, row_group_size=row_group_size)
+        
         print(f"✅ Data saved to: {path}")
         print(f"   Rows: {len(self.df)}, Columns: {len(self.df.columns)}")
     
@@ -207,50 +577,183 @@ class DataProcessor:
         
         Args:
             path: Output file path
+            
+        Note:
+            Written by pyarrow's multi-threaded C++ CSV writer instead of
+            DataFrame.to_csv(), which formats every cell in Python.
+            The output reads back like a DataFrame.to_csv() file: floats
+            keep a decimal point ('1.0', so they re-read as floats),
+            timezone-naive dates without a time of day are written as
+            YYYY-MM-DD (timezone-aware ones keep the full timestamp
+            and zone), and names/values are only quoted when they
+            contain a comma, quote or line break. (In that case pyarrow
+            quotes every name and text value, floats included, which
+            still reads back the same.)
+            For anything but small exports prefer save_to_parquet().
         """
-        self.df.to_csv(path, index=False)
+        table = _arrow_table(self.df)
+        
+        float_columns = []
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if (pa.types.is_timestamp(field.type) and field.type.tz is None
+                    and _is_date_only(self.df[field.name])):
+                # Daily data: write '2024-01-02', not '2024-01-02 00:00:00.000000000'
+                column = column.cast(pa.date32())
+            elif pa.types.is_floating(field.type):
+                column = _float_csv_text(column)
+                float_columns.append(field.name)
+            else:
+                continue
+            table = table.set_column(i, field.name, column)
+        
+        # pyarrow's 'needed' style quotes every text value (and the header),
+        # so only use it when some value really needs quotes
+        quoting = 'needed' if _csv_needs_quoting(table, float_columns) else 'none'
+        
+        try:
+            options = pacsv.WriteOptions(
+                include_header=True,
+                batch_size=64 * 1024,
+                quoting_style=quoting,
+                quoting_header=quoting
+            )
+        except TypeError:
+            # Older pyarrow has no quoting_header: the header is quoted
+            options = pacsv.WriteOptions(
+                include_header=True, batch_size=64 * 1024, quoting_style=quoting
+            )
+        
+        pacsv.write_csv(table, path, write_options=options)
         print(f"✅ Data saved to: {path}")
     
     # ================================================================
     # UTILITY METHODS
     # ================================================================
     
-    def get_dataframe(self) -> pd.DataFrame:
+    def get_dataframe(self, copy: bool = False) -> pd.DataFrame:
         """
         Get the processed DataFrame.
         
+        Args:
+            copy: Deep-copy the data (default False)
+            
+        Returns:
+            The processed DataFrame, as a new DataFrame object
+            
+        Note:
+            With Copy-on-Write the default shallow copy is already safe:
+            it shares the column buffers, and changing either frame
+            copies only the columns being changed. copy=True forces an
+            eager full copy.
+            The frame itself is never returned: CoW protects the data,
+            but not the frame object, so e.g. renaming or adding columns
+            on it would leak back into the processor. The shallow copy
+            costs O(columns), not O(rows).
+        """
+        return self.df.copy(deep=copy)
+    
+    def to_soa(self, dtype=np.float32) -> Dict[str, np.ndarray]:
+        """
+        Get the numeric columns as a dict of contiguous NumPy arrays.
+        
+        Args:
+            dtype: dtype of the arrays (default float32)
+            
         Returns:
-            The processed DataFrame
+            Dict mapping column name to a 1-D array, for every column of
+            NUMERIC_COLUMNS present. Missing values are NaN.
+            The arrays are always new, writable copies (never read-only
+            views of the processor's data), whatever the column dtypes.
+            
+        Example:
+            cols = processor.to_soa()
+            signal = cols['MA5'] > cols['MA20']
         """
-        return self.df.copy()
+        # copy=True only copies when no dtype conversion already did:
+        # a column that already has `dtype` would otherwise come back as
+        # a read-only Copy-on-Write view
+        return {
+            col: self.df[col].to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+            for col in self.NUMERIC_COLUMNS
+            if col in self.df.columns
+        }
     
-    def summary(self) -> None:
+    def to_matrix(self, dtype=np.float32) -> Tuple[np.ndarray, List[str]]:
+        """
+        Get the numeric columns as ONE 2-D C-contiguous NumPy array.
+        
+        Args:
+            dtype: dtype of the matrix (default float32)
+            
+        Returns:
+            Tuple (matrix, names): matrix has one row per date and one
+            column per name in `names` (the NUMERIC_COLUMNS present).
+            The matrix is always a new, writable array (never a read-only
+            view of the processor's data), whatever the column dtypes.
+            
+        Example:
+            matrix, names = processor.to_matrix()
+            close = matrix[:, names.index('close')]
+        """
+        names = [col for col in self.NUMERIC_COLUMNS if col in self.df.columns]
+        matrix = self.df[names].to_numpy(dtype=dtype, na_value=np.nan)
+        
+        # Copy (once) if the result is a read-only Copy-on-Write view of
+        # a single block, or not C-contiguous
+        if not matrix.flags['C_CONTIGUOUS'] or not matrix.flags['WRITEABLE']:
+            matrix = np.array(matrix, order='C')
+        return matrix, names
+    
+    def summary(self, verbose: bool = True) -> None:
         """
         Print a summary of the processed data.
+        
+        Args:
+            verbose: Print the summary (False skips all of the work,
+                handy inside per-symbol loops)
+            
+        Note:
+            The summary is built as a list of lines and written to
+            stdout in a single call, like DataQualityChecker.print_report().
         """
-        print("=" * 50)
-        print("        📊 DATA SUMMARY")
-        print("=" * 50)
-        print(f"\n📋 Shape: {self.df.shape[0]} rows × {self.df.shape[1]} columns")
-        print(f"\n📅 Date Range:")
+        if not verbose:
+            return
+        
+        lines = []
+        lines.append("=" * 50)
+        lines.append("        📊 DATA SUMMARY")
+        lines.append("=" * 50)
+        lines.append(f"\n📋 Shape: {self.df.shape[0]} rows × {self.df.shape[1]} columns")
+        lines.append(f"\n📅 Date Range:")
         
         if 'date' in self.df.columns:
-            print(f"   Start: {self.df['date'].min()}")
-            print(f"   End:   {self.df['date'].max()}")
+            lines.append(f"   Start: {self.df['date'].min()}")
+            lines.append(f"   End:   {self.df['date'].max()}")
         
-        print(f"\n📈 Columns: {list(self.df.columns)}")
+        lines.append(f"\n📈 Columns: {list(self.df.columns)}")
         
-        print(f"\n🔍 Missing Values:")
-        missing = self.df.isnull().sum()
-        if missing.sum() == 0:
-            print("   ✅ No missing values")
+        lines.append(f"\n🔍 Missing Values:")
+        # ONE NaN scan: the "any missing" check and the per-column
+        # counts are both reduced from the same boolean mask
+        mask = self.df.isna().to_numpy()
+        if not mask.any():
+            lines.append("   ✅ No missing values")
         else:
-            for col, count in missing[missing > 0].items():
-                print(f"   {col}: {count}")
+            counts = mask.sum(axis=0)
+            lines.extend(
+                f"   {col}: {int(count)}"
+                for col, count in zip(self.df.columns, counts)
+                if count
+            )
+        
+        # Only the first 5 rows and at most 8 columns are formatted
+        lines.append(f"\n📊 Sample Data (first 5 rows):")
+        lines.append(self.df.head(5).to_string(max_cols=8))
+        lines.append("=" * 50)
         
-        print(f"\n📊 Sample Data (first 5 rows):")
-        print(self.df.head().to_string())
-        print("=" * 50)
+        # One write for the whole summary
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ================================================================
@@ -260,7 +763,8 @@ class DataProcessor:
 def process_stock_data(
     input_path: str,
     output_path: str,
-    save_format: str = 'parquet'
+    save_format: str = 'parquet',
+    engine: Literal['pandas', 'polars'] = 'pandas'
 ) -> pd.DataFrame:
     """
     Convenience function to run the full ETL pipeline.
@@ -269,19 +773,31 @@ def process_stock_data(
         input_path: Path to input CSV file
         output_path: Path for output file
         save_format: 'parquet' or 'csv'
+        engine: 'pandas' (DataProcessor) or 'polars' (the lazy plan from
+            src.processors_lazy: multithreaded CSV read, clean and
+            features fused into one query; needs polars installed)
         
     Returns:
         Processed DataFrame
         
+    Raises:
+        ValueError: If engine is not 'pandas' or 'polars'
+        
     Example:
         df = process_stock_data(
             'data/raw/stock.csv',
             'data/processed/stock.parquet'
         )
     """
+    if engine == 'polars':
+        return _process_stock_data_polars(input_path, output_path, save_format)
+    if engine != 'pandas':
+        raise ValueError(f"engine must be 'pandas' or 'polars', got {engine!r}")
+    
     # Read raw data
     print(f"📂 Reading: {input_path}")
-    df = pd.read_csv(input_path)
+    # Dates are parsed during the CSV scan, not in a second pass
+    df = pd.read_csv(input_path, **_date_parse_options(input_path))
     
     # Process
     processor = DataProcessor(df)
@@ -295,3 +811,227 @@ def process_stock_data(
         processor.save_to_csv(output_path)
     
     return processor.get_dataframe()
+
+
+def _process_stock_data_polars(
+    input_path: str,
+    output_path: str,
+    save_format: str
+) -> pd.DataFrame:
+    """
+    process_stock_data() with engine='polars'.
+    
+    The lazy plan is collected once (the DataFrame has to be returned
+    anyway), written from Polars directly and converted to pandas.
+    """
+    # Imported here: polars is optional and only needed for this engine
+    from src.processors_lazy import build_lazy_pipeline
+    
+    print(f"📂 Reading (polars): {input_path}")
+    result = build_lazy_pipeline(input_path).collect()
+    
+    # Save
+    if save_format == 'parquet':
+        result.write_parquet(
+            output_path,
+            compression='zstd',
+            compression_level=3,
+            row_group_size=PARQUET_ROW_GROUP_SIZE,
+            statistics=True
+        )
+    else:
+        result.write_csv(output_path)
+    print(f"✅ Data saved to: {output_path}")
+    print(f"   Rows: {result.height}, Columns: {result.width}")
+    
+    return result.to_pandas()
+
+
+def process_stock_data_many(
+    glob_pattern: str,
+    out_dir: str,
+    compression: str = 'zstd'
+) -> int:
+    """
+    Run the ETL pipeline on many CSV files (e.g. one per ticker) in parallel.
+    
+    Uses Dask: every file becomes one partition, and each partition is
+    cleaned and gets its features inside a single map_partitions() task,
+    so the task graph is one level deep and all files run in parallel.
+    
+    Args:
+        glob_pattern: Input files, e.g. 'data/raw/tickers/*.csv'
+        out_dir: Output directory for the Parquet dataset
+            (one file per input; partitioned by 'symbol' if that column exists)
+        compression: Parquet compression codec (default 'zstd')
+        
+    Returns:
+        Number of input files processed
+        
+    Raises:
+        ImportError: If dask is not installed
+        
+    Note:
+        Files are never split into blocks: the rolling windows (MA5,
+        MA20, Vol_20) need each file's rows together and in order.
+        
+    Example:
+        n_files = process_stock_data_many(
+            'data/raw/tickers/*.csv',
+            'data/processed/tickers'
+        )
+    """
+    try:
+        import dask.dataframe as dd
+    except ImportError as e:
+        raise ImportError(
+            "process_stock_data_many requires dask. "
+            "Install it with: pip install 'dask[dataframe]'"
+        ) from e
+    
+    print(f"📂 Reading (dask): {glob_pattern}")
+    
+    # blocksize=None: one partition per file
+    ddf = dd.read_csv(glob_pattern, blocksize=None, assume_missing=True)
+    if 'date' in ddf.columns:
+        # Parse dates during the CSV scan (the columns come from the
+        # sampled header, nothing has been read yet). Files without a
+        # 'date' column are read as is
+        ddf = dd.read_csv(
+            glob_pattern,
+            blocksize=None,
+            parse_dates=['date'],
+            assume_missing=True
+        )
+    
+    # All cleaning and features in ONE task per partition
+    ddf = ddf.map_partitions(_process_partition)
+    
+    partition_on = ['symbol'] if 'symbol' in ddf.columns else None
+    ddf.to_parquet(
+        out_dir,
+        engine='pyarrow',
+        compression=compression,
+        write_index=False,
+        partition_on=partition_on
+    )
+    print(f"✅ Data saved to: {out_dir}")
+    print(f"   Files: {ddf.npartitions}")
+    
+    return ddf.npartitions
+
+
+def _process_partition(df: pd.DataFrame) -> pd.DataFrame:
+    """Clean one partition and add its features (process_stock_data_many)."""
+    return DataProcessor(df).clean().add_features().df
+
+
+def process_stock_data_chunked(
+    input_path: str,
+    output_path: str,
+    chunksize: int = 500_000,
+    compression: str = 'zstd',
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE
+) -> int:
+    """
+    Run the ETL pipeline chunk by chunk to keep peak memory low.
+    
+    The CSV is read `chunksize` rows at a time; each chunk is cleaned,
+    gets its features, and is appended to the Parquet file in row groups
+    of `row_group_size` rows. Only one chunk (plus a few rows of history) is ever in
+    memory, instead of the whole file.
+    
+    Args:
+        input_path: Path to input CSV file (must be sorted by date)
+        output_path: Path for output Parquet file
+        chunksize: Number of CSV rows per chunk
+        compression: Parquet compression codec (default 'zstd')
+        row_group_size: Max rows per Parquet row group
+            (default PARQUET_ROW_GROUP_SIZE)
+        
+    Returns:
+        Number of rows written
+        
+    Raises:
+        ValueError: If the input is not sorted by date (rows with a
+            missing date are dropped, as in clean(), not rejected).
+            No output file is left behind on an error.
+        
+    How chunk boundaries are handled:
+        The last FEATURE_LOOKBACK cleaned rows of each chunk are
+        prepended to the next one, so forward fill, duplicate removal
+        and the rolling windows (MA5, MA20, Vol_20) see the same history
+        they would in a single pass. Those rows are dropped again before
+        writing. Because rows are never re-sorted across chunks, the
+        input must already be in date order.
+        
+    Example:
+        rows = process_stock_data_chunked(
+            'data/raw/big_stock.csv',
+            'data/processed/big_stock.parquet',
+            chunksize=100_000
+        )
+    """
+    print(f"📂 Reading in chunks of {chunksize} rows: {input_path}")
+    
+    writer = None
+    history = None   # Cleaned tail of the previous chunk
+    total_rows = 0
+    completed = False
+    
+    try:
+        reader = pd.read_csv(
+            input_path,
+            chunksize=chunksize,
+            dtype=OHLCV_DTYPES,
+            **_date_parse_options(input_path)
+        )
+        for chunk in reader:
+            # Prepend history so fills and rolling windows continue seamlessly
+            n_history = 0
+            if history is not None:
+                n_history = len(history)
+                chunk = pd.concat([history, chunk], ignore_index=True)
+            
+            # Missing dates are dropped by clean(), so they don't count
+            if 'date' in chunk.columns and not chunk['date'].dropna().is_monotonic_increasing:
+                raise ValueError(
+                    "Chunked processing requires input sorted by date"
+                )
+            
+            processor = DataProcessor(chunk)
+            processor.clean()
+            history = processor.df.iloc[-FEATURE_LOOKBACK:]
+            processor.add_features()
+            
+            # Drop the history rows: they were written with the previous chunk
+            new_rows = _downcast_for_parquet(processor.df.iloc[n_history:])
+            
+            if writer is None:
+                table = pa.Table.from_pandas(new_rows, preserve_index=False)
+                filter_columns = _parquet_filter_columns(new_rows)
+                writer = pq.ParquetWriter(
+                    output_path,
+                    table.schema,
+                    compression=compression,
+                    use_dictionary=filter_columns,
+                    write_statistics=filter_columns
+                )
+            else:
+                table = pa.Table.from_pandas(new_rows, schema=writer.schema, preserve_index=False)
+            
+            writer.write_table(table, row_group_size=row_group_size)
+            total_rows += len(new_rows)
+        completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+            if not completed:
+                # A later chunk failed (e.g. unsorted input): don't leave
+                # a truncated Parquet file behind
+                os.remove(output_path)
+    
+    print(f"✅ Data saved to: {output_path}")
+    print(f"   Rows: {total_rows}")
+    
+    return total_rows
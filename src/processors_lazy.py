@@ -0,0 +1,98 @@
+"""
+processors_lazy.py - Polars Lazy ETL Pipeline
+
+This module expresses the whole ETL (read -> clean -> features -> write)
+as ONE Polars lazy query plan instead of three eager pandas passes:
+- The CSV is scanned, not loaded: nothing is read until the plan runs
+- Polars optimizes the whole plan at once (projection/predicate pushdown,
+  expression fusion)
+- sink_parquet() streams the result to disk, so inputs larger than
+  RAM can be processed
+
+The output matches DataProcessor.clean().add_features() column for column.
+
+Requires the optional dependency `polars` (pip install polars).
+
+Author: [Your Name]
+"""
+
+from typing import Optional
+
+try:
+    import polars as pl
+except ImportError as e:
+    raise ImportError(
+        "processors_lazy requires polars. Install it with: pip install polars"
+    ) from e
+
+
+def build_lazy_pipeline(input_path: str) -> 'pl.LazyFrame':
+    """
+    Build the lazy ETL plan for an OHLCV CSV file.
+    
+    Args:
+        input_path: Path to input CSV file
+        
+    Returns:
+        A Polars LazyFrame (call .collect() or .sink_parquet() to run it)
+        
+    Steps (same semantics as DataProcessor):
+        1. Parse 'date' to datetime
+        2. Sort by date (stable), dropping rows with a missing date
+        3. Remove duplicate dates, keeping the first occurrence
+        4. Forward fill, then backward fill missing values
+        5. Add daily_return, MA5, MA20, Vol_20
+    """
+    return (
+        pl.scan_csv(input_path)
+        .with_columns(pl.col('date').str.to_datetime(time_unit='ns'))
+        # Cleaning
+        .drop_nulls(subset=['date'])
+        .sort('date', maintain_order=True)
+        .unique(subset=['date'], keep='first', maintain_order=True)
+        .fill_null(strategy='forward')
+        .fill_null(strategy='backward')
+        # Feature engineering
+        .with_columns([
+            pl.col('close').pct_change().alias('daily_return'),
+            pl.col('close').rolling_mean(window_size=5).alias('MA5'),
+            pl.col('close').rolling_mean(window_size=20).alias('MA20'),
+        ])
+        .with_columns(
+            pl.col('daily_return').rolling_std(window_size=20).alias('Vol_20')
+        )
+    )
+
+
+def run_lazy_pipeline(
+    input_path: str,
+    output_path: str,
+    compression: str = 'zstd',
+    compression_level: Optional[int] = None
+) -> None:
+    """
+    Run the lazy ETL plan and stream the result to a Parquet file.
+    
+    Args:
+        input_path: Path to input CSV file
+        output_path: Path for output Parquet file
+        compression: Parquet compression codec (default 'zstd', the
+            same as DataProcessor.save_to_parquet())
+        compression_level: Codec level (None = 3 for zstd, codec
+            default otherwise)
+        
+    Example:
+        run_lazy_pipeline(
+            'data/raw/stock.csv',
+            'data/processed/stock.parquet'
+        )
+    """
+    if compression_level is None and compression == 'zstd':
+        compression_level = 3
+    
+    build_lazy_pipeline(input_path).sink_parquet(
+        output_path,
+        compression=compression,
+        compression_level=compression_level
+    )
+    print(f"✅ Data saved to: {output_path}")
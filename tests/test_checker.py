@@ -279,6 +279,23 @@ def test_no_extreme_moves():
     assert extreme == 0, "Stable data should have no extreme moves"
 
 
+def test_zero_close_not_counted_as_extreme():
+    """Test that a move from a zero close (undefined return) is not counted."""
+    df = pd.DataFrame({
+        'date': ['2024-01-01', '2024-01-02', '2024-01-03'],
+        'open':   [0, 100, 101],
+        'high':   [0, 102, 103],
+        'low':    [0, 99,  100],
+        'close':  [0, 101, 102],     # Return from 0 is undefined
+        'volume': [1000, 1100, 1200]
+    })
+    
+    checker = DataQualityChecker(df)
+    extreme = checker.check_extreme_moves()
+    
+    assert extreme == 0, "Return from a zero close should be skipped"
+
+
 # ================================================================
 # TEST 8: Full Report (完整报告测试)
 # ================================================================
@@ -377,6 +394,29 @@ def test_all_same_prices():
     assert report['price_range_errors'] == 0
 
 
+def test_original_df_not_modified():
+    """Test that the checker does not modify the caller's DataFrame."""
+    df = create_clean_data()
+    
+    checker = DataQualityChecker(df)
+    checker.run_all_checks()
+    
+    # 'date' should still hold the original strings (parsed copy is internal)
+    assert df['date'].tolist() == create_clean_data()['date'].tolist(), \
+        "Original DataFrame should not be modified"
+
+
+def test_preparsed_dates():
+    """Test that already-parsed datetime dates give the same report."""
+    df = create_clean_data()
+    df_parsed = df.assign(date=pd.to_datetime(df['date']))
+    
+    report = DataQualityChecker(df).run_all_checks()
+    report_parsed = DataQualityChecker(df_parsed).run_all_checks()
+    
+    assert report == report_parsed
+
+
 # ================================================================
 # Run tests directly (optional)
 # ================================================================
@@ -0,0 +1,137 @@
+"""
+test_io_utils.py - io_utils.py 的测试用例
+
+运行方式：
+    pytest tests/test_io_utils.py -v
+
+测试覆盖：
+    - read_csv(): pyarrow 路径和 pandas 退回路径的列类型一致，无法解析的日期、有小数的成交量
+    - load_ohlcv(): 读取 OHLCV CSV（正常文件、没有 date 列、短行、空白日期）
+"""
+
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.io_utils import load_ohlcv, read_csv
+
+
+HEADER = "date,open,high,low,close,volume\n"
+
+
+def write_csv(tmp_path, text):
+    """把 CSV 文本写入临时文件，返回路径字符串"""
+    path = tmp_path / 'data.csv'
+    path.write_text(text)
+    return str(path)
+
+
+# ============================================================
+# 测试 read_csv() 函数
+# ============================================================
+
+def test_read_csv_same_dtypes_on_both_paths(tmp_path):
+    """测试正常文件（pyarrow 解析）和有短行的文件（pandas 解析）列类型相同"""
+    good = tmp_path / 'good.csv'
+    good.write_text(HEADER + "2024-01-01,1,2,0.5,1.5,100\n2024-01-02,1,2,0.5,1.5,\n")
+    ragged = tmp_path / 'ragged.csv'
+    ragged.write_text(HEADER + "2024-01-01,1,2,0.5,1.5,100\n2024-01-02,1,2\n")
+    
+    df_good = read_csv(str(good))
+    df_ragged = read_csv(str(ragged))
+    
+    assert df_good['volume'].dtype == 'Int64', "缺失的 volume 应为 <NA>，而不是变成 float64"
+    assert df_good['volume'].isna().iloc[1]
+    pd.testing.assert_series_equal(df_good.dtypes, df_ragged.dtypes)
+
+
+def test_read_csv_bad_date_becomes_nat(tmp_path):
+    """测试无法解析的日期读成 NaT，其他行照常读取"""
+    path = write_csv(tmp_path, HEADER + "2024-01-01,1,2,0.5,1.5,100\nnot a date,1,2,0.5,1.5,100\n")
+    df = read_csv(path)
+    
+    assert df['date'].dtype == 'datetime64[ns]'
+    assert df['date'].iloc[0] == pd.Timestamp('2024-01-01')
+    assert pd.isna(df['date'].iloc[1])
+
+
+def test_read_csv_fractional_volume(tmp_path):
+    """测试有小数的成交量：volume 保留为 float64，而不是读取失败"""
+    path = write_csv(tmp_path, HEADER + "2024-01-01,1,2,0.5,1.5,100.5\n2024-01-02,1,2,0.5,1.5,200\n")
+    df = read_csv(path)
+    
+    assert df['volume'].dtype == np.float64
+    assert list(df['volume']) == [100.5, 200.0]
+    assert df['close'].dtype == np.float32
+
+
+# ============================================================
+# 测试 load_ohlcv() 函数
+# ============================================================
+
+def test_load_ohlcv_types(tmp_path):
+    """测试 date 解析为日期，价格是 float32，volume 是 Int64"""
+    path = write_csv(tmp_path, HEADER + "2024-01-01,1,2,0.5,1.5,100\n2024-01-02,1,2,0.5,1.5,200\n")
+    df = load_ohlcv(path)
+    
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+    assert df['close'].dtype == np.float32
+    assert df['volume'].dtype == 'Int64'
+
+
+def test_load_ohlcv_without_date_column(tmp_path):
+    """测试没有 date 列的文件也能读取（由 DataQualityChecker 报告缺少的列）"""
+    path = write_csv(tmp_path, "open,high,low,close,volume\n1,2,0.5,1.5,100\n")
+    df = load_ohlcv(path)
+    
+    assert 'date' not in df.columns
+    assert len(df) == 1
+
+
+def test_load_ohlcv_short_row(tmp_path):
+    """测试列数不足的短行：缺失的单元格填 NaN，而不是读取失败"""
+    path = write_csv(
+        tmp_path,
+        HEADER + "2024-01-01,1,2,0.5,1.5,100\n2024-01-02,1,2\n2024-01-03,1,2,0.5,1.5,100\n"
+    )
+    df = load_ohlcv(path)
+    
+    assert len(df) == 3
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+    assert np.isnan(df['close'].iloc[1])
+    assert df['volume'].isna().iloc[1]
+
+
+def test_load_ohlcv_blank_date(tmp_path):
+    """测试空白的日期单元格读成 NaT，而不是字符串 'None'"""
+    path = write_csv(
+        tmp_path,
+        HEADER + "2024-01-01,1,2,0.5,1.5,100\n,1,2,0.5,1.5,100\n2024-01-03,1,2,0.5,1.5,100\n"
+    )
+    df = load_ohlcv(path)
+    
+    assert pd.api.types.is_datetime64_any_dtype(df['date'])
+    assert pd.isna(df['date'].iloc[1])
+    assert df['date'].iloc[2] == pd.Timestamp('2024-01-03')
+
+
+def test_load_ohlcv_other_date_format_stays_string(tmp_path):
+    """测试日期格式不匹配时 date 列保持为字符串（空白为 NaN）"""
+    path = write_csv(tmp_path, HEADER + "01/02/2024,1,2,0.5,1.5,100\n,1,2,0.5,1.5,100\n")
+    df = load_ohlcv(path)
+    
+    assert df['date'].iloc[0] == '01/02/2024'
+    assert pd.isna(df['date'].iloc[1])
+
+
+# ============================================================
+# 运行测试（如果直接运行这个文件）
+# ============================================================
+
+if __name__ == "__main__":
+    print("请使用 pytest 运行测试：")
+    print("  pytest tests/test_io_utils.py -v")
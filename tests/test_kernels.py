@@ -0,0 +1,327 @@
+"""
+test_kernels.py - Unit tests for rolling-window kernels
+
+This file contains tests to verify that the incremental kernels give
+the same results as pandas' rolling implementation.
+
+Run with: pytest tests/test_kernels.py -v
+"""
+
+import sys
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import kernels
+from src.kernels import (
+    daily_return, rolling_features, rolling_features_2d,
+    rolling_sum, rolling_mean, rolling_mean_std
+)
+
+
+# ================================================================
+# TEST: rolling_sum / rolling_mean
+# ================================================================
+
+def test_rolling_mean_matches_pandas():
+    """Test that rolling_mean equals pandas rolling().mean()."""
+    np.random.seed(42)
+    x = 100 + np.cumsum(np.random.randn(200))
+    
+    for window in [1, 5, 20]:
+        expected = pd.Series(x).rolling(window).mean().to_numpy()
+        actual = rolling_mean(x, window)
+        np.testing.assert_allclose(actual, expected, rtol=1e-10)
+
+
+def test_rolling_sum_first_rows_nan():
+    """Test that the first window-1 values are NaN."""
+    result = rolling_sum([1, 2, 3, 4, 5], 3)
+    
+    assert np.isnan(result[:2]).all()
+    assert list(result[2:]) == [6.0, 9.0, 12.0]
+
+
+def test_rolling_sum_nan_in_window():
+    """Test that any window containing NaN is NaN (like pandas)."""
+    x = [1.0, np.nan, 3.0, 4.0, 5.0, 6.0]
+    
+    expected = pd.Series(x).rolling(3).sum().to_numpy()
+    actual = rolling_sum(x, 3)
+    
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_rolling_inf_in_window(monkeypatch):
+    """Test that inf only spoils the windows containing it (like pandas), on every path."""
+    np.random.seed(8)
+    x = 100 + np.cumsum(np.random.randn(5000))
+    x[[100, 2500]] = [np.inf, -np.inf]
+    
+    expected = {w: pd.Series(x).rolling(w).mean().to_numpy() for w in [5, 7, 20]}
+    assert np.isnan(expected[20][100:120]).all() and np.isfinite(expected[20][120:2500]).all()
+    
+    def check():
+        for window, mean in expected.items():
+            np.testing.assert_allclose(rolling_sum(x, window), mean * window, rtol=1e-10)
+            np.testing.assert_allclose(rolling_mean(x, window), mean, rtol=1e-10)
+        _, ma5, ma20, _ = rolling_features(x, 5, 20)
+        np.testing.assert_allclose(ma5, expected[5], rtol=1e-10)
+        np.testing.assert_allclose(ma20, expected[20], rtol=1e-10)
+    
+    check()
+    
+    if kernels.NUMBA_AVAILABLE:
+        # Multi-threaded rolling_sum
+        monkeypatch.setattr(kernels, 'PARALLEL_MIN_SIZE', 0)
+        check()
+        monkeypatch.undo()
+    
+    # No-Numba fallbacks: prefix sums, and Bottleneck if installed
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    check()
+    monkeypatch.setattr(kernels, 'BOTTLENECK_AVAILABLE', False)
+    check()
+
+
+def test_rolling_window_longer_than_data():
+    """Test that a window longer than the data gives all NaN."""
+    result = rolling_mean([1.0, 2.0], 5)
+    
+    assert np.isnan(result).all()
+
+
+def test_rolling_invalid_window():
+    """Test that window < 1 raises an error."""
+    with pytest.raises(ValueError):
+        rolling_sum([1.0, 2.0], 0)
+
+
+# ================================================================
+# TEST: rolling_mean_std
+# ================================================================
+
+def test_rolling_mean_std_matches_pandas():
+    """Test that mean and std (ddof=1) equal pandas rolling()."""
+    np.random.seed(42)
+    x = 100 + np.cumsum(np.random.randn(200))
+    x[50] = np.nan
+    
+    for window in [5, 20]:
+        mean, std = rolling_mean_std(x, window)
+        rolling = pd.Series(x).rolling(window)
+        np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-10)
+        np.testing.assert_allclose(std, rolling.std().to_numpy(), rtol=1e-8)
+
+
+def test_rolling_std_precision_large_values(monkeypatch):
+    """Test that std stays accurate for large values with a tiny spread."""
+    x = 1e8 + np.tile([0.0, 0.01], 50)
+    
+    _, std = rolling_mean_std(x, 20)
+    expected = pd.Series(x).rolling(20).std().to_numpy()
+    
+    np.testing.assert_allclose(std[19:], expected[19:], rtol=1e-4)
+    
+    # Same for the no-Numba prefix-sum fallback
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    _, std = rolling_mean_std(x, 20)
+    np.testing.assert_allclose(std[19:], expected[19:], rtol=1e-4)
+
+
+def test_rolling_std_precision_long_trend(monkeypatch):
+    """Test that the no-Numba std stays accurate over a long trending series."""
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    
+    np.random.seed(9)
+    n = 200_000
+    x = 100 + 0.05 * np.arange(n) + 0.1 * np.cumsum(np.random.randn(n))
+    x[[1000, 150_000]] = np.nan
+    
+    # Exact two-pass std of every window
+    expected = sliding_window_view(x, 20).std(axis=1, ddof=1)
+    
+    _, std = rolling_mean_std(x, 20)
+    np.testing.assert_allclose(std[19:], expected, rtol=1e-6)
+
+
+def test_parallel_rolling_sum_matches_serial(monkeypatch):
+    """Test that the multi-threaded rolling_sum gives the serial result, also around NaN."""
+    if not kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    
+    np.random.seed(3)
+    x = 100 + np.cumsum(np.random.randn(1000))
+    x[[10, 500, 501]] = np.nan
+    expected = rolling_sum(x, 20)
+    
+    # Block sizes smaller than, around and larger than the window,
+    # plus more blocks than rows
+    for n_chunks in [1, 3, 7, 64, 2000]:
+        result = kernels._rolling_sum_parallel_nb(x, 20, n_chunks)
+        np.testing.assert_allclose(result, expected, rtol=1e-10)
+    
+    # The public function switches to it above PARALLEL_MIN_SIZE
+    monkeypatch.setattr(kernels, 'PARALLEL_MIN_SIZE', 0)
+    np.testing.assert_allclose(rolling_sum(x, 20), expected, rtol=1e-10)
+
+
+def test_specialized_kernels_match_generic():
+    """Test that the fixed-window kernels in _KERNEL_CACHE match the generic ones."""
+    if not kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    
+    np.random.seed(4)
+    x = 100 + np.cumsum(np.random.randn(300))
+    x[77] = np.nan
+    
+    for arr in [x, x.astype(np.float32)]:
+        for window in [5, 20]:
+            assert ('mean', window) in kernels._KERNEL_CACHE
+            result = rolling_mean(arr, window)
+            assert result.dtype == arr.dtype
+            np.testing.assert_allclose(result, rolling_sum(arr, window) / window, rtol=1e-6)
+        
+        fused = kernels._KERNEL_CACHE[('features', 5, 20)](arr)
+        generic = kernels._rolling_features_nb(arr, 5, 20)
+        for a, b in zip(fused, generic):
+            np.testing.assert_array_equal(a, b)
+
+
+# ================================================================
+# TEST: daily_return / rolling_features
+# ================================================================
+
+def test_daily_return_matches_pct_change():
+    """Test that daily_return equals pandas pct_change(), including zero and NaN prices."""
+    x = np.array([100.0, 102.0, 0.0, 5.0, np.nan, 7.0, 0.0, 0.0])
+    expected = pd.Series(x).pct_change(fill_method=None).to_numpy()
+    
+    np.testing.assert_allclose(daily_return(x), expected, rtol=1e-12)
+
+
+def test_rolling_features_matches_separate_kernels(monkeypatch):
+    """Test that the fused kernel gives the same four features as the separate passes."""
+    np.random.seed(5)
+    x = 100 + np.cumsum(np.random.randn(300))
+    x[[50, 120]] = np.nan
+    x[200] = 0.0
+    
+    ret = daily_return(x)
+    expected = (
+        ret,
+        rolling_mean_std(x, 5)[0],
+        rolling_mean_std(x, 20)[0],
+        rolling_mean_std(ret, 20)[1],
+    )
+    
+    for result, exp in zip(rolling_features(x, 5, 20), expected):
+        np.testing.assert_allclose(result, exp, rtol=1e-9)
+    
+    # Fallback path: the separate kernels
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    for result, exp in zip(rolling_features(x, 5, 20), expected):
+        np.testing.assert_allclose(result, exp, rtol=1e-9)
+
+
+def test_fallback_matches_numba(monkeypatch):
+    """Test that the no-Numba fallback gives the same results."""
+    if not kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+    
+    np.random.seed(0)
+    x = 100 + np.cumsum(np.random.randn(100))
+    fast_mean, fast_std = rolling_mean_std(x, 20)
+    fast_sum = rolling_sum(x, 5)
+    
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    slow_mean, slow_std = rolling_mean_std(x, 20)
+    
+    np.testing.assert_allclose(fast_mean, slow_mean, rtol=1e-10)
+    np.testing.assert_allclose(fast_std, slow_std, rtol=1e-8)
+    np.testing.assert_allclose(fast_sum, rolling_sum(x, 5), rtol=1e-10)
+
+
+def test_float32_input_stays_float32():
+    """Test that float32 input gives float32 output with float64-level accuracy."""
+    np.random.seed(1)
+    x = (100 + np.cumsum(np.random.randn(300))).astype(np.float32)
+    
+    mean, std = rolling_mean_std(x, 20)
+    assert mean.dtype == np.float32 and std.dtype == np.float32
+    assert rolling_mean(x, 5).dtype == np.float32
+    
+    # Same values as the float64 computation, up to float32 rounding
+    expected = pd.Series(x.astype(np.float64)).rolling(20)
+    np.testing.assert_allclose(mean, expected.mean().to_numpy(), rtol=1e-6)
+    np.testing.assert_allclose(std, expected.std().to_numpy(), rtol=1e-4)
+
+
+def test_cumsum_fallback_matches_pandas(monkeypatch):
+    """Test that the no-Numba prefix-sum rolling_sum handles NaN and short input like pandas."""
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    monkeypatch.setattr(kernels, 'BOTTLENECK_AVAILABLE', False)
+    
+    np.random.seed(6)
+    x = 100 + np.cumsum(np.random.randn(200))
+    x[[0, 30, 31, 150]] = np.nan
+    
+    for window in [1, 5, 20]:
+        expected = pd.Series(x).rolling(window, min_periods=window).sum().to_numpy()
+        np.testing.assert_allclose(rolling_sum(x, window), expected, rtol=1e-10)
+        np.testing.assert_allclose(rolling_mean(x, window), expected / window, rtol=1e-10)
+    
+    assert np.isnan(rolling_sum(x[:3], 5)).all()
+
+
+def test_bottleneck_fallback_matches_pandas(monkeypatch):
+    """Test that the Bottleneck moving average matches pandas, also for float32 and short input."""
+    pytest.importorskip("bottleneck")
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', False)
+    
+    np.random.seed(7)
+    x = 100 + np.cumsum(np.random.randn(200))
+    x[[0, 30, 31, 150]] = np.nan
+    
+    for arr in [x, x.astype(np.float32)]:
+        for window in [1, 5, 20]:
+            result = rolling_mean(arr, window)
+            assert result.dtype == arr.dtype
+            expected = pd.Series(arr.astype(np.float64)).rolling(window).mean().to_numpy()
+            np.testing.assert_allclose(result, expected, rtol=1e-6)
+    
+    assert np.isnan(rolling_mean(x[:3], 5)).all()
+
+
+def test_rolling_features_2d_matches_rows(monkeypatch):
+    """Test that the batch kernel gives rolling_features() of every row, with and without Numba."""
+    np.random.seed(8)
+    close = 100 + np.cumsum(np.random.randn(6, 120), axis=1)
+    close[2, 40] = np.nan
+    close[4, 10] = 0.0
+    
+    expected = [rolling_features(row, 5, 20) for row in close]
+    
+    for numba_available in [kernels.NUMBA_AVAILABLE, False]:
+        monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', numba_available)
+        result = rolling_features_2d(close, 5, 20)
+        for i, feature in enumerate(result):
+            assert feature.shape == close.shape
+            for s in range(close.shape[0]):
+                np.testing.assert_allclose(feature[s], expected[s][i], rtol=1e-9)
+    
+    with pytest.raises(ValueError):
+        rolling_features_2d(close[0])
+
+
+# ================================================================
+# Run tests directly (optional)
+# ================================================================
+
+if __name__ == "__main__":
+    print("Please run tests with: pytest tests/test_kernels.py -v")
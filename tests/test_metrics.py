@@ -8,15 +8,18 @@ test_metrics.py - metrics.py 的测试用例
     - mean(): 均值计算
     - std(): 标准差计算
     - max_drawdown(): 最大回撤计算
+    - metrics_fast.max_drawdown(): Numba 加速版最大回撤
 """
 
 import sys
 import os
+import numpy as np
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.metrics import mean, std, max_drawdown
+from src import metrics_fast
 
 
 # ============================================================
@@ -116,6 +119,17 @@ def test_max_drawdown_always_down():
     assert abs(result - expected) < 0.0001
 
 
+def test_max_drawdown_with_nan():
+    """测试净值中有 NaN：跳过 NaN，而不是结果变成 0 或 NaN"""
+    nav = [1.0, 1.2, np.nan, 0.9, 1.0]
+    result = max_drawdown(nav)
+    # 跳过 NaN 后和 [1.0, 1.2, 0.9, 1.0] 一样：(1.2 - 0.9) / 1.2 = 0.25
+    assert abs(result - 0.25) < 0.0001
+    
+    # 开头是 NaN 也一样
+    assert abs(max_drawdown([np.nan] + nav[1:]) - 0.25) < 0.0001
+
+
 def test_max_drawdown_empty():
     """测试空列表"""
     result = max_drawdown([])
@@ -140,6 +154,49 @@ def test_max_drawdown_example_from_task():
     assert abs(result - expected) < 0.0001
 
 
+def test_max_drawdown_numpy_array():
+    """测试 NumPy 数组输入（向量化版本应与列表输入结果一致）"""
+    nav = [1.0, 1.2, 1.1, 0.9, 1.0]
+    result = max_drawdown(np.array(nav))
+    expected = max_drawdown(nav)
+    assert result == expected
+
+
+# ============================================================
+# 测试数组输入
+# ============================================================
+
+def test_mean_std_numpy_array():
+    """测试 mean/std 接受 NumPy 数组"""
+    arr = np.array([1.0, 2.0, 3.0])
+    assert mean(arr) == 2.0
+    assert abs(std(arr) - 0.816496580927726) < 0.0001
+
+
+# ============================================================
+# 测试 metrics_fast.max_drawdown()（Numba 版本）
+# ============================================================
+
+def test_fast_max_drawdown_matches_numpy():
+    """测试 Numba 版本与 NumPy 版本结果一致"""
+    test_cases = [
+        [1.0, 1.2, 1.1, 0.9, 1.0],
+        [1.0, 1.1, 1.2, 1.3, 1.4],
+        [1.0, 0.9, 0.8, 0.7],
+        [1.0, 1.1, 1.05, 1.2, 1.0],
+        [1.0, 1.2, np.nan, 0.9, 1.0],
+        [np.nan, 1.2, 1.1, 0.9, np.nan],
+    ]
+    for nav in test_cases:
+        assert abs(metrics_fast.max_drawdown(nav) - max_drawdown(nav)) < 1e-12
+
+
+def test_fast_max_drawdown_edge_cases():
+    """测试空列表和单个值"""
+    assert metrics_fast.max_drawdown([]) == 0.0
+    assert metrics_fast.max_drawdown([1.0]) == 0.0
+
+
 # ============================================================
 # 运行测试（如果直接运行这个文件）
 # ============================================================
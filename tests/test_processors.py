@@ -14,20 +14,23 @@ import os
 import pytest
 import pandas as pd
 import numpy as np
-import tempfile
+import pyarrow.parquet as pq
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.processors import DataProcessor
+from src.config import OHLCV_DTYPES
+from src.processors import (
+    DataProcessor, compute_features_batch, process_stock_data, process_stock_data_chunked
+)
 
 
 # ================================================================
 # Helper Function: Create test data
 # ================================================================
 
-def create_sample_data(rows=25):
-    """Create a clean sample DataFrame for testing."""
+def _build_sample(rows):
+    """Build the deterministic OHLCV sample frame."""
     dates = pd.date_range(start='2024-01-01', periods=rows, freq='D')
     
     # Generate price data (upward trend with some noise)
@@ -44,8 +47,20 @@ def create_sample_data(rows=25):
     })
 
 
-def create_dirty_data():
-    """Create a DataFrame with missing values for testing."""
+# Built once; create_sample_data() hands out copies of its first rows
+_SAMPLE_BASE = _build_sample(64)
+
+
+def create_sample_data(rows=25):
+    """Create a clean sample DataFrame for testing."""
+    if rows > len(_SAMPLE_BASE):
+        return _build_sample(rows)
+    # Deep copy: tests may modify the frame they get
+    return _SAMPLE_BASE.iloc[:rows].copy()
+
+
+def _build_dirty():
+    """Build the DataFrame with missing values."""
     return pd.DataFrame({
         'date': ['2024-01-01', '2024-01-02', '2024-01-03', 
                  '2024-01-04', '2024-01-05', '2024-01-06'],
@@ -57,6 +72,16 @@ def create_dirty_data():
     })
 
 
+# Built once, like _SAMPLE_BASE
+_DIRTY_BASE = _build_dirty()
+
+
+def create_dirty_data():
+    """Create a DataFrame with missing values for testing."""
+    # Deep copy: tests may modify the frame they get
+    return _DIRTY_BASE.copy()
+
+
 # ================================================================
 # TEST: Data Cleaning - Missing Values
 # ================================================================
@@ -172,6 +197,30 @@ def test_keep_first_duplicate():
     assert jan2_open == 102, "First occurrence should be kept"
 
 
+def test_dedupe_unsorted_tz_aware_dates():
+    """Test sort + dedupe on unsorted timezone-aware dates with a missing date."""
+    dates = pd.to_datetime(
+        ['2024-01-03', None, '2024-01-01', '2024-01-03', '2024-01-02']
+    ).tz_localize('UTC')
+    df = pd.DataFrame({
+        'date': dates,
+        'open':  [103, 0, 101, 999, 102],  # 999 is a later duplicate of Jan 3
+        'high':  [105, 0, 105, 105, 105],
+        'low':   [99, 0, 99, 99, 99],
+        'close': [103, 0, 101, 999, 102],
+        'volume': [1000000] * 5
+    })
+    
+    processor = DataProcessor(df)
+    processor.clean()
+    
+    expected = df.dropna(subset=['date']).sort_values('date', kind='stable').drop_duplicates('date')
+    assert list(processor.df['open']) == list(expected['open']), \
+        "Rows should be in date order, first occurrence kept, missing date dropped"
+    assert processor.df['date'].is_unique
+    assert list(processor.df['date']) == list(expected['date'])
+
+
 # ================================================================
 # TEST: Feature Engineering - Moving Averages
 # ================================================================
@@ -354,7 +403,7 @@ def test_vol20_has_values():
 # TEST: File Operations
 # ================================================================
 
-def test_save_to_parquet():
+def test_save_to_parquet(tmp_path):
     """Test that data can be saved to Parquet format."""
     df = create_sample_data(10)
     
@@ -362,27 +411,19 @@ def test_save_to_parquet():
     processor.clean()
     processor.add_features()
     
-    # Use temporary file
-    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
-        temp_path = f.name
-    
-    try:
-        processor.save_to_parquet(temp_path)
-        
-        # Verify file exists
-        assert os.path.exists(temp_path), "Parquet file should be created"
-        
-        # Verify file can be read
-        df_loaded = pd.read_parquet(temp_path)
-        assert len(df_loaded) == len(processor.df), "Row count should match"
-        
-    finally:
-        # Cleanup
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-
-
-def test_parquet_preserves_data():
+    # tmp_path is a per-test directory that pytest cleans up
+    path = tmp_path / 'out.parquet'
+    processor.save_to_parquet(str(path))
+    
+    # Verify file exists
+    assert path.exists(), "Parquet file should be created"
+    
+    # Verify file can be read
+    df_loaded = pd.read_parquet(path)
+    assert len(df_loaded) == len(processor.df), "Row count should match"
+
+
+def test_parquet_preserves_data(tmp_path):
     """Test that Parquet preserves data correctly."""
     df = create_sample_data(10)
     
@@ -390,24 +431,153 @@ def test_parquet_preserves_data():
     processor.clean()
     processor.add_features()
     
-    with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as f:
-        temp_path = f.name
-    
-    try:
-        processor.save_to_parquet(temp_path)
-        df_loaded = pd.read_parquet(temp_path)
-        
-        # Check columns match
-        assert list(df_loaded.columns) == list(processor.df.columns), \
-            "Columns should match"
-        
-        # Check close prices match
-        assert list(df_loaded['close']) == list(processor.df['close']), \
-            "Close prices should match"
-        
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    path = tmp_path / 'out.parquet'
+    processor.save_to_parquet(str(path))
+    df_loaded = pd.read_parquet(path)
+    
+    # Check columns match
+    assert list(df_loaded.columns) == list(processor.df.columns), \
+        "Columns should match"
+    
+    # Check close prices match
+    assert np.array_equal(df_loaded['close'].to_numpy(), processor.df['close'].to_numpy()), \
+        "Close prices should match"
+
+
+def test_parquet_streamed_row_groups(tmp_path):
+    """Test that save_to_parquet writes one row group per batch and round-trips exactly."""
+    df = create_sample_data(25)
+    df.loc[3, 'close'] = np.nan   # Also check a NaN survives the batching
+    
+    processor = DataProcessor(df)
+    processor.add_features()
+    
+    path = tmp_path / 'out.parquet'
+    processor.save_to_parquet(str(path), row_group_size=10, float32_features=False)
+    
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 3, "25 rows / 10 per group = 3 row groups"
+    assert metadata.row_group(0).column(0).compression == 'ZSTD'
+    
+    # date min/max per row group, so readers can skip groups
+    stats = metadata.row_group(1).column(0).statistics
+    assert stats.has_min_max
+    assert stats.min == processor.df['date'].iloc[10]
+    assert stats.max == processor.df['date'].iloc[19]
+    
+    # Float columns are never filtered on, so they get no statistics
+    close_idx = processor.df.columns.get_loc('close')
+    assert metadata.row_group(1).column(close_idx).statistics is None
+    
+    # NaN is stored as a Parquet null, not as a NaN value
+    assert pq.read_table(path).column('MA5').null_count == processor.df['MA5'].isna().sum()
+    
+    pd.testing.assert_frame_equal(pd.read_parquet(path), processor.df)
+
+
+def test_parquet_float32_features(tmp_path):
+    """Test that features are stored as float32 while prices keep their dtype."""
+    processor = DataProcessor(create_sample_data(30))
+    processor.clean().add_features()
+    
+    path = tmp_path / 'out.parquet'
+    processor.save_to_parquet(str(path))
+    df_loaded = pd.read_parquet(path)
+    
+    for col in ['daily_return', 'MA5', 'MA20', 'Vol_20']:
+        assert df_loaded[col].dtype == np.float32, f"{col} should be stored as float32"
+        np.testing.assert_allclose(df_loaded[col], processor.df[col], rtol=1e-6)
+    
+    assert df_loaded['close'].dtype == processor.df['close'].dtype
+    assert processor.df['MA5'].dtype == np.float64, "In-memory frame is unchanged"
+
+
+def test_save_to_csv_round_trip(tmp_path):
+    """Test that save_to_csv writes plain dates and values that read back unchanged."""
+    processor = DataProcessor(create_dirty_data())
+    processor.clean().add_features()
+    
+    path = tmp_path / 'out.csv'
+    processor.save_to_csv(str(path))
+    
+    with open(path) as f:
+        assert f.readline().startswith('date,open,'), "Plain names should not be quoted"
+        assert f.readline().startswith('2024-01-01,100.0,'), "Daily dates should be YYYY-MM-DD"
+    
+    # Whole-valued floats (e.g. filled close prices) must re-read as floats
+    df_loaded = pd.read_csv(path, parse_dates=['date'])
+    pd.testing.assert_frame_equal(df_loaded, processor.df)
+
+
+def test_save_to_csv_keeps_timezone(tmp_path):
+    """Test that timezone-aware midnight dates are not written as plain dates."""
+    df = create_sample_data(5)
+    df['date'] = df['date'].dt.tz_localize('UTC')
+    processor = DataProcessor(df)
+    
+    path = tmp_path / 'out.csv'
+    processor.save_to_csv(str(path))
+    
+    df_loaded = pd.read_csv(path, parse_dates=['date'])
+    assert str(df_loaded['date'].dt.tz) == 'UTC', "The timezone should survive the round trip"
+    assert (df_loaded['date'] == processor.df['date']).all()
+
+
+# ================================================================
+# TEST: NumPy Export
+# ================================================================
+
+def test_to_soa_and_to_matrix():
+    """Test that to_soa() and to_matrix() export the same numeric columns."""
+    processor = DataProcessor(create_sample_data(25))
+    processor.clean().add_features()
+    
+    cols = processor.to_soa()
+    matrix, names = processor.to_matrix()
+    
+    assert names == DataProcessor.NUMERIC_COLUMNS
+    assert list(cols) == names
+    assert matrix.dtype == np.float32 and matrix.flags['C_CONTIGUOUS']
+    assert matrix.flags['WRITEABLE']
+    assert matrix.shape == (25, len(names))
+    
+    for i, name in enumerate(names):
+        assert cols[name].dtype == np.float32 and cols[name].flags['WRITEABLE']
+        np.testing.assert_array_equal(matrix[:, i], cols[name])
+        np.testing.assert_allclose(cols[name], processor.df[name], rtol=1e-6)
+
+
+def test_to_soa_and_to_matrix_are_writable_copies():
+    """Test that exported arrays are writable copies, also when no dtype conversion is needed."""
+    processor = DataProcessor(create_sample_data(25))
+    
+    for dtype in [np.float64, np.float32]:
+        cols = processor.to_soa(dtype=dtype)
+        for name in ['open', 'high', 'low', 'close']:
+            assert cols[name].flags['WRITEABLE']
+            assert not np.shares_memory(cols[name], processor.df[name].to_numpy())
+    
+    # Prices only: one float64 block, so to_numpy() alone would be a view
+    processor = DataProcessor(create_sample_data(25)[['date', 'open', 'high', 'low', 'close']])
+    matrix, names = processor.to_matrix(dtype=np.float64)
+    assert matrix.flags['WRITEABLE'] and matrix.flags['C_CONTIGUOUS']
+    assert not np.shares_memory(matrix, processor.df['close'].to_numpy())
+
+
+def test_compute_features_batch_matches_add_features():
+    """Test that the batch features of each symbol equal add_features() on that symbol."""
+    frames = [create_sample_data(30), create_sample_data(30)]
+    frames[1]['close'] = frames[1]['close'] * 2 + 5
+    close = np.stack([df['close'].to_numpy() for df in frames])
+    
+    features = compute_features_batch(close)
+    
+    for s, df in enumerate(frames):
+        processor = DataProcessor(df)
+        processor.add_features()
+        for col, values in features.items():
+            assert values.shape == close.shape
+            np.testing.assert_allclose(values[s], processor.df[col].to_numpy(), rtol=1e-12)
 
 
 # ================================================================
@@ -436,16 +606,81 @@ def test_method_chaining():
 def test_already_clean_data():
     """Test that clean data is not corrupted."""
     df = create_sample_data(10)
-    original_close = df['close'].tolist()
+    original_close = df['close'].to_numpy().copy()
     
     processor = DataProcessor(df)
     processor.clean()
     
     # Close prices should be unchanged
-    assert processor.df['close'].tolist() == original_close, \
+    assert np.array_equal(processor.df['close'].to_numpy(), original_close), \
         "Clean data should not be modified"
 
 
+def test_clean_data_not_rewritten():
+    """Test that clean() on already-clean data skips every rewrite."""
+    df = create_sample_data(10)
+    
+    processor = DataProcessor(df)
+    processor.clean()
+    
+    # Still the caller's buffers: nothing was sorted, deduped or filled
+    assert np.shares_memory(processor.df['close'].to_numpy(), df['close'].to_numpy())
+    pd.testing.assert_frame_equal(processor.df, df)
+
+
+def test_date_column_parsed_once():
+    """Test that string dates are parsed up front and parsed dates are kept as they are."""
+    processor = DataProcessor(create_dirty_data())
+    assert pd.api.types.is_datetime64_any_dtype(processor.df['date'])
+    
+    df = create_sample_data(5)
+    processor = DataProcessor(df)
+    assert np.shares_memory(processor.df['date'].to_numpy(), df['date'].to_numpy()), \
+        "Already-parsed dates should not be converted again"
+
+
+def test_add_features_sees_edits_after_clean():
+    """Test that add_features() uses the current close prices, not ones saved by clean()."""
+    processor = DataProcessor(create_sample_data(10))
+    processor.clean()
+    
+    processor.df.loc[4, 'close'] = 1000.0  # Edit after clean()
+    processor.add_features()
+    
+    expected = processor.df['close'].iloc[:5].mean()
+    assert abs(processor.df['MA5'].iloc[4] - expected) < 1e-9
+
+
+def test_fill_leaves_complete_columns_shared():
+    """Test that filling missing values only replaces the columns that had gaps."""
+    df = create_sample_data(10)
+    df.loc[3, 'close'] = np.nan
+    
+    processor = DataProcessor(df)
+    processor.clean()
+    
+    assert processor.df['close'].iloc[3] == df['close'].iloc[2], "close should be filled"
+    assert np.isnan(df['close'].iloc[3]), "Caller's data must not be filled"
+    assert np.shares_memory(processor.df['open'].to_numpy(), df['open'].to_numpy()), \
+        "Columns without gaps should not be copied"
+
+
+def test_dict_input():
+    """Test that a dict of arrays gives the same result as a DataFrame, without changing the arrays."""
+    df = create_dirty_data()
+    columns = {col: df[col].to_numpy().copy() for col in df.columns}
+    original_high = columns['high'].copy()
+    
+    processor = DataProcessor(columns)
+    processor.clean().add_features()
+    processor.df.loc[0, 'high'] = 999  # In-place edit of a column clean() kept
+    
+    expected = DataProcessor(df).clean().add_features().df
+    expected.loc[0, 'high'] = 999
+    pd.testing.assert_frame_equal(processor.df, expected)
+    np.testing.assert_array_equal(columns['high'], original_high)
+
+
 def test_get_dataframe_returns_copy():
     """Test that get_dataframe returns a copy, not the original."""
     df = create_sample_data(5)
@@ -461,6 +696,20 @@ def test_get_dataframe_returns_copy():
         "get_dataframe should return a copy"
 
 
+def test_get_dataframe_shares_until_modified():
+    """Test that get_dataframe() shares buffers but in-place edits never leak back."""
+    processor = DataProcessor(create_sample_data(5))
+    processor.clean()
+    
+    df_view = processor.get_dataframe()
+    assert df_view is not processor.df
+    assert np.shares_memory(df_view['close'].to_numpy(), processor.df['close'].to_numpy())
+    
+    df_view.loc[0, 'close'] = 999  # In-place edit of one cell
+    assert processor.df['close'].iloc[0] != 999, \
+        "Edits to the returned frame must not change the processor"
+
+
 def test_original_df_not_modified():
     """Test that the original DataFrame is not modified."""
     df = create_dirty_data()
@@ -476,6 +725,230 @@ def test_original_df_not_modified():
         "Original DataFrame should not be modified"
 
 
+def test_original_columns_not_modified():
+    """Test that clean() never writes into the caller's columns or dates."""
+    df = create_dirty_data()
+    original = df.copy()
+    
+    processor = DataProcessor(df)
+    processor.clean()
+    processor.add_features()
+    
+    # Same values, same (string) date column, no new columns
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_downcast_dtypes():
+    """Test that downcast=True stores float32 prices and features with the same values."""
+    df = create_sample_data(30)
+    
+    full = DataProcessor(df).clean().add_features().df
+    small = DataProcessor(df, downcast=True).clean().add_features().df
+    
+    for col in ['open', 'high', 'low', 'close', 'daily_return', 'MA5', 'MA20', 'Vol_20']:
+        assert small[col].dtype == np.float32, f"{col} should be float32"
+        np.testing.assert_allclose(small[col], full[col], rtol=1e-5, atol=1e-6)
+    
+    # Volumes between 1M and 2M fit in uint32
+    assert small['volume'].dtype == np.uint32
+    assert small['volume'].tolist() == full['volume'].tolist()
+
+
+def test_summary_output(capsys):
+    """Test that summary() reports missing values and verbose=False prints nothing."""
+    processor = DataProcessor(create_dirty_data())
+    
+    processor.summary()
+    out = capsys.readouterr().out
+    assert "open: 2" in out and "close: 1" in out
+    
+    processor.summary(verbose=False)
+    assert capsys.readouterr().out == ""
+
+
+# ================================================================
+# TEST: Chunked ETL
+# ================================================================
+
+def test_chunked_matches_single_pass(tmp_path):
+    """Test that chunked processing gives the same result as one pass."""
+    df = create_sample_data(25)
+    df.loc[3, 'close'] = np.nan
+    df.loc[8, 'open'] = np.nan
+    # Duplicate date right at a chunk boundary (rows 0-3 | 4-7 | ...)
+    df = pd.concat([df.iloc[:4], df.iloc[[3]], df.iloc[4:]], ignore_index=True)
+    
+    input_path = tmp_path / 'input.csv'
+    output_path = tmp_path / 'out.parquet'
+    df.to_csv(input_path, index=False)
+    
+    rows = process_stock_data_chunked(str(input_path), str(output_path), chunksize=4)
+    df_chunked = pd.read_parquet(output_path)
+    
+    processor = DataProcessor(
+        pd.read_csv(input_path, dtype=OHLCV_DTYPES, parse_dates=['date'])
+    )
+    processor.clean().add_features()
+    
+    assert rows == 25, "Duplicate row should be removed"
+    pd.testing.assert_frame_equal(df_chunked, processor.df)
+
+
+def test_process_stock_data_without_date_column(tmp_path):
+    """Test that a CSV without a date column is processed in full and chunked mode."""
+    input_path = tmp_path / 'no_date.csv'
+    create_sample_data(30).drop(columns='date').to_csv(input_path, index=False)
+    
+    df = process_stock_data(str(input_path), str(tmp_path / 'out.parquet'))
+    rows = process_stock_data_chunked(
+        str(input_path), str(tmp_path / 'chunked.parquet'), chunksize=8
+    )
+    
+    assert 'date' not in df.columns
+    assert len(df) == 30 and rows == 30
+
+
+def test_chunked_drops_missing_dates(tmp_path):
+    """Test that a missing date in sorted input is dropped, not rejected as unsorted."""
+    df = create_sample_data(30)
+    df['date'] = df['date'].astype(object)
+    df.loc[10, 'date'] = None
+    
+    input_path = tmp_path / 'missing_date.csv'
+    output_path = tmp_path / 'chunked.parquet'
+    df.to_csv(input_path, index=False)
+    
+    rows = process_stock_data_chunked(str(input_path), str(output_path), chunksize=8)
+    
+    processor = DataProcessor(
+        pd.read_csv(input_path, dtype=OHLCV_DTYPES, parse_dates=['date'])
+    )
+    processor.clean().add_features()
+    
+    assert rows == 29
+    pd.testing.assert_frame_equal(pd.read_parquet(output_path), processor.df)
+
+
+def test_chunked_requires_sorted_input(tmp_path):
+    """Test that unsorted input is rejected in chunked mode."""
+    df = create_sample_data(10).iloc[::-1]
+    
+    input_path = tmp_path / 'input.csv'
+    df.to_csv(input_path, index=False)
+    
+    with pytest.raises(ValueError):
+        process_stock_data_chunked(str(input_path), str(tmp_path / 'out.parquet'), chunksize=4)
+
+
+def test_chunked_unsorted_later_chunk_leaves_no_file(tmp_path):
+    """Test that unsorted rows in a later chunk don't leave a truncated Parquet file."""
+    df = create_sample_data(12)
+    df = pd.concat([df.iloc[:8], df.iloc[8:].iloc[::-1]], ignore_index=True)
+    
+    input_path = tmp_path / 'input.csv'
+    output_path = tmp_path / 'out.parquet'
+    df.to_csv(input_path, index=False)
+    
+    with pytest.raises(ValueError, match="sorted by date"):
+        process_stock_data_chunked(str(input_path), str(output_path), chunksize=4)
+    assert not output_path.exists()
+
+
+# ================================================================
+# TEST: Polars Lazy Pipeline (optional dependency)
+# ================================================================
+
+def test_lazy_pipeline_matches_processor(tmp_path):
+    """Test that the Polars lazy plan produces the same output as DataProcessor."""
+    pytest.importorskip('polars')
+    from src.processors_lazy import run_lazy_pipeline
+    
+    input_path = tmp_path / 'dirty.csv'
+    output_path = tmp_path / 'out.parquet'
+    create_dirty_data().to_csv(input_path, index=False)
+    
+    run_lazy_pipeline(str(input_path), str(output_path))
+    df_lazy = pd.read_parquet(output_path)
+    
+    processor = DataProcessor(create_dirty_data())
+    processor.clean().add_features()
+    
+    pd.testing.assert_frame_equal(df_lazy, processor.df, check_dtype=False)
+    # Same codec as DataProcessor.save_to_parquet()
+    codec = pq.ParquetFile(output_path).metadata.row_group(0).column(0).compression
+    assert codec == 'ZSTD'
+
+
+def test_lazy_pipeline_drops_missing_dates(tmp_path):
+    """Test that both engines drop a row with a missing date the same way."""
+    pytest.importorskip('polars')
+    from src.processors_lazy import run_lazy_pipeline
+    
+    df = create_sample_data(30)
+    df['date'] = df['date'].astype(object)
+    df.loc[10, 'date'] = None
+    
+    input_path = tmp_path / 'missing_date.csv'
+    output_path = tmp_path / 'out.parquet'
+    df.to_csv(input_path, index=False)
+    
+    run_lazy_pipeline(str(input_path), str(output_path))
+    df_lazy = pd.read_parquet(output_path)
+    
+    processor = DataProcessor(pd.read_csv(input_path))
+    processor.clean().add_features()
+    
+    assert len(processor.df) == 29 and processor.df['date'].is_unique
+    pd.testing.assert_frame_equal(df_lazy, processor.df, check_dtype=False)
+
+
+def test_process_stock_data_polars_engine(tmp_path):
+    """Test that engine='polars' returns and saves the same data as the pandas engine."""
+    pytest.importorskip('polars')
+    
+    input_path = tmp_path / 'dirty.csv'
+    create_dirty_data().to_csv(input_path, index=False)
+    
+    df_pandas = process_stock_data(str(input_path), str(tmp_path / 'pandas.parquet'))
+    df_polars = process_stock_data(
+        str(input_path), str(tmp_path / 'polars.parquet'), engine='polars'
+    )
+    
+    pd.testing.assert_frame_equal(df_polars, df_pandas, check_dtype=False)
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / 'polars.parquet'), df_pandas, check_dtype=False
+    )
+
+
+def test_process_stock_data_many(tmp_path):
+    """Test that the Dask pipeline processes every file on its own, like DataProcessor."""
+    pytest.importorskip('dask.dataframe')
+    from src.processors import process_stock_data_many
+    
+    for name in ['a', 'b']:
+        create_dirty_data().to_csv(tmp_path / f'{name}.csv', index=False)
+    
+    n_files = process_stock_data_many(str(tmp_path / '*.csv'), str(tmp_path / 'out'))
+    assert n_files == 2
+    
+    df_many = pd.read_parquet(tmp_path / 'out')
+    expected = DataProcessor(create_dirty_data()).clean().add_features().df
+    expected = pd.concat([expected, expected], ignore_index=True)
+    
+    pd.testing.assert_frame_equal(df_many, expected, check_dtype=False)
+
+
+def test_process_stock_data_many_without_date_column(tmp_path):
+    """Test that the Dask pipeline reads files without a date column."""
+    pytest.importorskip('dask.dataframe')
+    from src.processors import process_stock_data_many
+    
+    create_sample_data(30).drop(columns='date').to_csv(tmp_path / 'a.csv', index=False)
+    
+    assert process_stock_data_many(str(tmp_path / '*.csv'), str(tmp_path / 'out')) == 1
+    assert len(pd.read_parquet(tmp_path / 'out')) == 30
+
+
 # ================================================================
 # Run tests directly (optional)
 # ================================================================